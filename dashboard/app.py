@@ -1,10 +1,26 @@
-from dashboard.screen import WeatherScreen, DashboardScreen
+from dashboard.screen import DashboardScreen
 from dashboard.widgets.pomodoro_widget import PomodoroConfigPopup
 from textual.app import App
+from textual.screen import Screen
+from collections import defaultdict
 from pathlib import Path
+from typing import Callable
 import argparse
+import importlib
+import subprocess
 import sys
-from dashboard.logger import logger
+from dashboard.utils import load_env, perf
+from dashboard.logger import LOG_PATH, attach_app, configure_logging, get_logger, parse_levels
+
+logger = get_logger(__name__)
+
+
+def lazy_screen(module: str, name: str) -> Callable[[], Screen]:
+    """Screen factory for MODES, importing the screen's module on the first
+    switch to its mode rather than at startup."""
+    def factory() -> Screen:
+        return getattr(importlib.import_module(module), name)()
+    return factory
 
 
 class DashboardApp(App):
@@ -13,18 +29,21 @@ class DashboardApp(App):
     BINDINGS = [
         ("🏠️", "switch_mode('dashboard')", "Dashboard"),
         ("☁️", "switch_mode('weather')", "Weather"),
+        ("📈", "switch_mode('perf')", "Perf"),
     ]
     MODES = {
         "dashboard": DashboardScreen,
-        "weather": WeatherScreen,
+        "weather": lazy_screen("dashboard.screen.weather_screen", "WeatherScreen"),
+        "perf": lazy_screen("dashboard.screen.perf_screen", "PerfScreen"),
         "pomodoro_config": PomodoroConfigPopup,
     }
 
     def __init__(self, small_screen: bool = False):
         super().__init__()
+        attach_app(self)
         self.small_screen = small_screen
         logger.info(
-            f"DashboardApp initialized with small_screen={small_screen}")
+            "DashboardApp initialized with small_screen=%s", small_screen)
 
     def on_mount(self) -> None:
         self.theme = "nord"
@@ -32,6 +51,34 @@ class DashboardApp(App):
         self.switch_mode("dashboard")
 
 
+def profile_startup(limit: int = 20) -> None:
+    """Print an import-time breakdown of the app, measured with -X importtime
+    in a fresh interpreter so nothing is already imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import dashboard.app"],
+        capture_output=True, text=True)
+    modules = []  # (self, cumulative, name), in microseconds
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules.append((int(self_us), int(cumulative_us), name.strip()))
+    if result.returncode != 0 or not modules:
+        sys.exit(f"Failed to profile startup:\n{result.stderr}")
+
+    packages = defaultdict(int)
+    for self_us, _, name in modules:
+        packages[name.split(".")[0]] += self_us
+    total = sum(packages.values())
+    print(f"Importing dashboard.app: {total / 1000:.1f} ms, {len(modules)} modules\n")
+    print(f"{'By package':<40} {'ms':>8} {'%':>6}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:limit]:
+        print(f"{package:<40} {self_us / 1000:>8.1f} {self_us / total:>6.1%}")
+    print(f"\n{'Slowest modules (including their imports)':<52} {'ms':>8} {'self ms':>8}")
+    for self_us, cumulative_us, name in sorted(modules, key=lambda module: -module[1])[:limit]:
+        print(f"{name:<52} {cumulative_us / 1000:>8.1f} {self_us / 1000:>8.1f}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Dashboard CLI")
     parser.add_argument(
@@ -40,8 +87,48 @@ def main():
         help="Use small screen layout (optimized for Raspberry Pi displays)"
     )
 
+    parser.add_argument(
+        "--log-level",
+        help="Level of the dashboard's logs (default INFO, or LOG_LEVEL)"
+    )
+    parser.add_argument(
+        "--log",
+        action="append",
+        default=[],
+        metavar="MODULE=LEVEL",
+        help="Level of one module's logs, e.g. widgets.obsidian_widget=DEBUG or urllib3=DEBUG (repeatable)"
+    )
+    parser.add_argument(
+        "--log-file",
+        nargs="?",
+        const=LOG_PATH,
+        help=f"Also write logs to a rotating file (default {LOG_PATH}, or LOG_PATH)"
+    )
+
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import-time breakdown of the app and exit"
+    )
+    parser.add_argument(
+        "--perf",
+        action="store_true",
+        help="Collect performance stats from startup, not only while the perf screen is open"
+    )
+
     args = parser.parse_args()
-    logger.info(f"Starting dashboard with small_screen={args.small_screen}")
+    if args.profile_startup:
+        profile_startup()
+        return
+
+    load_env()
+    try:
+        levels = parse_levels(args.log)
+    except ValueError as e:
+        parser.error(str(e))
+    configure_logging(args.log_level, levels, args.log_file)
+    perf.enabled = perf.keep_enabled = args.perf
+    logger.info("Starting dashboard with small_screen=%s", args.small_screen)
 
     app = DashboardApp(small_screen=args.small_screen)
     app.run()
@@ -0,0 +1,286 @@
+"""
+Headless benchmarks of the dashboard, driven through Textual's pilot in the
+normal and small screen layouts, against the stand-ins in dashboard.stubs
+(wttr.in, ipapi.co and the Obsidian API), so they need no network.
+
+    python -m dashboard.bench --output bench.json
+
+Each layout runs in its own process, with its own stubs and an empty cache.
+It reports:
+- time to first paint, and until the weather and Obsidian data are shown
+- the cost of a DashboardScreen.update_time fan-out, over a simulated run of
+  --simulated-seconds driven through the tick scheduler
+- the cost of a Pomodoro tick, when the displayed second is unchanged and
+  when it is rendered
+- RSS at start, peak and end of the simulated run
+- how often a per-second tick scheduler job fires across both DST
+  transitions of --dst-zone; the run fails if one of its ticks is skipped
+
+Results are printed as JSON, to be compared across commits.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from zoneinfo import ZoneInfo
+
+LAYOUTS = ("normal", "small")
+DEFAULT_SIMULATED_SECONDS = 6 * 3600
+DEFAULT_ITERATIONS = 2000
+DATA_TIMEOUT = 10  # seconds to wait for the stubs' data to be displayed
+# Simulated seconds between pauses letting the app process refreshes and
+# workers, and between RSS samples
+PAUSE_EVERY = 60
+RSS_EVERY = 600
+DEFAULT_DST_ZONE = "Europe/Paris"
+DST_MARGIN = 300  # real seconds simulated on each side of a DST transition
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def summarize(durations: list[float]) -> dict:
+    """Durations (seconds) as microsecond statistics."""
+    ordered = sorted(durations)
+    return {
+        "count": len(ordered),
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p95_us": ordered[int(len(ordered) * 0.95)] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def start_stubs() -> list:
+    """Start every backend stand-in and point the dashboard at them."""
+    from dashboard.stubs import ipapi_server, obsidian_server, wttr_server
+
+    obsidian = obsidian_server.start_server()
+    wttr = wttr_server.start_server()
+    ipapi = ipapi_server.start_server()
+    os.environ.update({
+        "API_URL": obsidian.url,
+        "API_KEY": obsidian_server.DEFAULT_API_KEY,
+        "WTTR_URL": wttr.url,
+        "WTTR_REPORT_URL": wttr.report_url,
+        "IPAPI_URL": ipapi.url,
+        "DASHBOARD_CACHE_DIR": tempfile.mkdtemp(prefix="dashboard-bench-"),
+    })
+    os.environ.pop("DASHBOARD_CITY", None)
+    return [obsidian, wttr, ipapi]
+
+
+async def wait_for(pilot, condition, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        await pilot.pause(0.005)
+    return True
+
+
+async def bench_layout(small_screen: bool, simulated_seconds: int, iterations: int) -> dict:
+    # Imported once the stubs' URLs are in the environment
+    from dashboard.app import DashboardApp
+    from dashboard.screen import DashboardScreen
+    from dashboard.widgets import ObsidianWidget, PomodoroWidget, WeatherWidget
+    from textual.widgets import Static
+
+    results = {}
+    start = time.perf_counter()
+    app = DashboardApp(small_screen=small_screen)
+    async with app.run_test(size=(100, 30) if small_screen else (200, 60)) as pilot:
+        await wait_for(pilot, lambda: isinstance(app.screen, DashboardScreen)
+                       and app.screen.is_mounted, DATA_TIMEOUT)
+        await pilot.pause()
+        results["first_paint_s"] = time.perf_counter() - start
+
+        screen = app.screen
+        weather = screen.query_one(WeatherWidget)
+        obsidian = screen.query_one(ObsidianWidget)
+        loaded = await wait_for(pilot, lambda: obsidian.data is not None and "Loading" not in str(
+            weather.query_one(Static).renderable), DATA_TIMEOUT)
+        await pilot.pause()
+        results["data_ready_s"] = time.perf_counter() - start if loaded else None
+
+        # Pomodoro: checks that find the same second, then renders
+        pomodoro = screen.query_one(PomodoroWidget)
+        pomodoro.action_start(pomodoro.work_duration)
+        pomodoro.make_progress()
+        durations = []
+        for _ in range(iterations):
+            tick_start = time.perf_counter()
+            pomodoro.make_progress()
+            durations.append(time.perf_counter() - tick_start)
+        results["pomodoro_check"] = summarize(durations)
+        durations = []
+        for index in range(iterations):
+            pomodoro.displayed_remaining = None
+            tick_start = time.perf_counter()
+            pomodoro.make_progress()
+            durations.append(time.perf_counter() - tick_start)
+            if index % PAUSE_EVERY == 0:
+                await pilot.pause()
+        results["pomodoro_render"] = summarize(durations)
+        pomodoro.reset_timer()
+
+        # update_time fan-out over a simulated run, seconds ahead of the
+        # real clock so the screen's own interval does not fire anything
+        rss = [rss_bytes()]
+        now = datetime.now().replace(microsecond=0) + timedelta(seconds=2)
+        durations = []
+        for second in range(simulated_seconds):
+            simulated = now + timedelta(seconds=second)
+            tick_start = time.perf_counter()
+            screen.time = simulated
+            screen.scheduler.tick(simulated)
+            durations.append(time.perf_counter() - tick_start)
+            if second % PAUSE_EVERY == 0:
+                await pilot.pause()
+            if second % RSS_EVERY == 0:
+                rss.append(rss_bytes())
+        await pilot.pause()
+        rss.append(rss_bytes())
+        results["update_time_fanout"] = summarize(durations)
+        results["simulated_seconds"] = simulated_seconds
+        results["rss_mib"] = {
+            "start": rss[0] / 2**20,
+            "peak": max(rss) / 2**20,
+            "end": rss[-1] / 2**20,
+            "growth": (rss[-1] - rss[0]) / 2**20,
+        }
+    return results
+
+
+def dst_transitions(zone: ZoneInfo, year: int) -> list[datetime]:
+    """The UTC instants in `year` where `zone` changes its UTC offset."""
+    transitions = []
+    hour = datetime(year, 1, 1, tzinfo=timezone.utc)
+    offset = hour.astimezone(zone).utcoffset()
+    while hour.year == year:
+        next_hour = hour + timedelta(hours=1)
+        if next_hour.astimezone(zone).utcoffset() != offset:
+            # Offsets change on a minute, find it
+            minute = hour
+            while minute.astimezone(zone).utcoffset() == offset:
+                minute += timedelta(minutes=1)
+            transitions.append(minute)
+            offset = minute.astimezone(zone).utcoffset()
+        hour = next_hour
+    return transitions
+
+
+def check_dst(zone_name: str, year: int) -> list[dict]:
+    """Drive a TickScheduler with the naive local time of `zone_name`, one
+    tick per real second around each of its DST transitions in `year`, and
+    count the ticks where its per-second job did not fire."""
+    from dashboard.utils.scheduler import SECOND, MINUTE, TickScheduler
+
+    zone = ZoneInfo(zone_name)
+
+    def local(instant: datetime) -> datetime:
+        return instant.astimezone(zone).replace(tzinfo=None, fold=0)
+
+    results = []
+    for transition in dst_transitions(zone, year):
+        start = transition - timedelta(seconds=DST_MARGIN)
+        # Across the fall-back, the wall clock repeats an hour
+        span = 2 * DST_MARGIN + 3600
+        scheduler = TickScheduler()
+        fired = {SECOND: 0, MINUTE: 0}
+        for every in fired:
+            scheduler.register(
+                lambda _, every=every: fired.__setitem__(every, fired[every] + 1),
+                every, now=local(start - timedelta(seconds=1)))
+        for second in range(span):
+            scheduler.tick(local(start + timedelta(seconds=second)))
+        results.append({
+            "transition_utc": transition.isoformat(),
+            "ticks": span,
+            "second_job_fired": fired[SECOND],
+            "minute_job_fired": fired[MINUTE],
+            "skipped_ticks": span - fired[SECOND],
+        })
+    return results
+
+
+def run_layout(layout: str, simulated_seconds: int, iterations: int) -> dict:
+    start_stubs()
+    return asyncio.run(bench_layout(layout == "small", simulated_seconds, iterations))
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless dashboard benchmarks")
+    parser.add_argument("--layout", choices=LAYOUTS, action="append",
+                        help="Layout to benchmark (repeatable, default all)")
+    parser.add_argument("--simulated-seconds", type=int, default=DEFAULT_SIMULATED_SECONDS,
+                        help="Length of the simulated run driving update_time")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="Pomodoro ticks measured")
+    parser.add_argument("--dst-zone", default=DEFAULT_DST_ZONE,
+                        help="Time zone whose DST transitions the scheduler is checked across")
+    parser.add_argument("--output", help="Also write the results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    layouts = args.layout or list(LAYOUTS)
+
+    if args.child:
+        # One layout, in a fresh process: print only its results
+        print(json.dumps(run_layout(layouts[0], args.simulated_seconds, args.iterations)))
+        return
+
+    results = {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "simulated_seconds": args.simulated_seconds,
+        "iterations": args.iterations,
+        "layouts": {},
+        "dst": check_dst(args.dst_zone, datetime.now().year),
+    }
+    for layout in layouts:
+        child = subprocess.run(
+            [sys.executable, "-m", "dashboard.bench", "--child", "--layout", layout,
+             "--simulated-seconds", str(args.simulated_seconds),
+             "--iterations", str(args.iterations)],
+            capture_output=True, text=True)
+        if child.returncode != 0:
+            sys.exit(f"{layout} layout benchmark failed:\n{child.stderr}")
+        results["layouts"][layout] = json.loads(child.stdout.strip().splitlines()[-1])
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    if any(check["skipped_ticks"] for check in results["dst"]):
+        sys.exit("The tick scheduler skipped ticks across a DST transition")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,130 @@
+import atexit
+import importlib.util
 import logging
+import logging.handlers
 import os
+import queue
 from textual.logging import TextualHandler
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from textual.app import App
 
 LOG_PATH = os.path.join(os.path.dirname(
     os.path.dirname(__file__)), 'dashboard.log')
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
 
-logging.basicConfig(
-    level="NOTSET",
-    handlers=[TextualHandler()],
-    format='%(asctime)s %(levelname)s: %(message)s',
-)
-
+# Levels when nothing is configured: third party libraries (urllib3...) only
+# report problems, the dashboard its lifecycle
+DEFAULT_LEVEL = "WARNING"
+DEFAULT_DASHBOARD_LEVEL = "INFO"
 
 logger = logging.getLogger('dashboard')
-logger.setLevel(logging.DEBUG)
-# logger.handlers.append(TextualHandler())
-# logger.propagate = False
-
-# if not logger.handlers:
-#     file_handler = logging.FileHandler(LOG_PATH)
-#     formatter = logging.Formatter('%(asctime)s %(levelname)s: %(message)s')
-#     file_handler.setFormatter(formatter)
-#     logger.addHandler(file_handler)
+
+_listener: logging.handlers.QueueListener | None = None
+_app: "App | None" = None  # Where the console handler sends records, see attach_app
+
+
+class ConsoleHandler(TextualHandler):
+    """Sends records to the Textual devtools console of the attached app.
+
+    It runs on the logging thread, which has no active app: records are
+    handed to the app's event loop (post_message is thread safe), and
+    dropped unless a console is connected. With no app running, they are
+    printed to stderr as TextualHandler does."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        app = _app
+        if app is None or not app.is_running:
+            super().emit(record)
+            return
+        devtools = app.devtools
+        if devtools is None or not devtools.is_connected:
+            return
+        app.call_later(app.log.logging, self.format(record))
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get the logger of a dashboard module, e.g. get_logger(__name__),
+    so its level can be set on its own with --log."""
+    if name == "__main__":
+        name = "dashboard.app"
+    return logging.getLogger(name)
+
+
+def parse_levels(specs: list[str]) -> dict[str, str]:
+    """Parse "name=LEVEL" specs into {logger name: level}.
+    Names of dashboard modules may leave out the package ("widgets.obsidian_widget"),
+    other names are used as is ("urllib3", or "root")."""
+    levels = {}
+    for spec in specs:
+        name, _, level = spec.rpartition("=")
+        if not name or level.upper() not in logging.getLevelNamesMapping():
+            raise ValueError(f"Invalid log level spec {spec!r}, expected name=LEVEL")
+        if name.split(".")[0] != "dashboard" and importlib.util.find_spec(
+                f"dashboard.{name.split('.')[0]}") is not None:
+            name = f"dashboard.{name}"
+        levels[name] = level.upper()
+    return levels
+
+
+def configure_logging(level: str | None = None, levels: dict[str, str] | None = None,
+                      log_path: str | None = None) -> None:
+    """Send log records to the Textual console and, if log_path (or the
+    LOG_PATH environment variable) is set, to a rotating file. Every handler
+    sits behind a queue drained by a background thread, so logging calls made
+    by the UI don't wait on the console or the disk.
+
+    level is the dashboard's level (LOG_LEVEL environment variable), levels
+    overrides it per logger name."""
+    global _listener
+    stop_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    console_handler = ConsoleHandler()
+    console_handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [console_handler]
+
+    log_path = log_path or os.getenv("LOG_PATH")
+    if log_path:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(DEFAULT_LEVEL)
+    logger.setLevel((level or os.getenv("LOG_LEVEL") or DEFAULT_DASHBOARD_LEVEL).upper())
+    for name, name_level in (levels or {}).items():
+        logging.getLogger(None if name == "root" else name).setLevel(name_level)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def attach_app(app: "App") -> None:
+    """Send the console's records to `app`, and configure logging with the
+    defaults unless configure_logging was already called (e.g. when the app
+    is started by `textual run` rather than main)."""
+    global _app
+    _app = app
+    if _listener is None:
+        configure_logging()
+
+
+def stop_logging() -> None:
+    """Flush the queued records and stop the logging thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
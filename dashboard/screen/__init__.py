@@ -1,3 +1,15 @@
-from .weather_screen import WeatherScreen
-from .dashboard_screen import DashboardScreen
-# from .fun_term_screen import FunTermScreen
+import importlib
+
+# Screens are imported on first access: the app only loads the ones it shows
+_SCREENS = {
+    "WeatherScreen": ".weather_screen",
+    "DashboardScreen": ".dashboard_screen",
+    "PerfScreen": ".perf_screen",
+    # "FunTermScreen": ".fun_term_screen",
+}
+
+
+def __getattr__(name: str):
+    if name in _SCREENS:
+        return getattr(importlib.import_module(_SCREENS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,17 @@
 
 from textual.app import ComposeResult, Screen
 from textual.widgets import Footer
-from dashboard.logger import logger
+from dashboard.logger import get_logger
 from textual.reactive import reactive
 from datetime import datetime
 from textual.containers import Horizontal, Vertical
 from dashboard.widgets import TimeWidget, WeatherWidget, PomodoroWidget, ObsidianWidget
+from dashboard.utils import prefetch_weather_reports, TickScheduler, timed
+
+logger = get_logger(__name__)
+
+# How often (seconds) the weather screen's reports are re-warmed in the background
+WEATHER_PREFETCH_INTERVAL = 10 * 60
 
 
 class DashboardScreen(Screen):
@@ -13,13 +19,17 @@ class DashboardScreen(Screen):
 
     def __init__(self):
         super().__init__()
+        # Widgets declare a TICK_EVERY cadence and a tick(time) method, and
+        # are only called when their cadence comes due
+        self.scheduler = TickScheduler()
         # Get small_screen from the app
         self.small_screen = getattr(self.app, 'small_screen', False)
         if self.small_screen:
             self.add_class("small-screen")
         logger.info(
-            f"DashboardScreen initialized with small_screen={self.small_screen}")
+            "DashboardScreen initialized with small_screen=%s", self.small_screen)
 
+    @timed("compose")
     def compose(self) -> ComposeResult:
         logger.debug("Composing DashboardApp")
 
@@ -27,25 +37,38 @@ class DashboardScreen(Screen):
             # Small screen layout
             with Vertical():
                 with Horizontal(classes="top-row"):
-                    yield TimeWidget("Europe/Paris", small_screen=True).data_bind(time=DashboardScreen.time)
-                    yield WeatherWidget(small_screen=True).data_bind(time=DashboardScreen.time)
-                    yield PomodoroWidget(small_screen=True).data_bind(time=DashboardScreen.time)
+                    yield TimeWidget("Europe/Paris", small_screen=True)
+                    yield WeatherWidget(small_screen=True)
+                    yield PomodoroWidget(small_screen=True)
 
                 with Horizontal(classes="bottom-row"):
-                    yield ObsidianWidget(small_screen=True).data_bind(time=DashboardScreen.time)
+                    yield ObsidianWidget(small_screen=True)
         else:
             # Regular layout
-            yield WeatherWidget(small_screen=False).data_bind(time=DashboardScreen.time)
-            yield TimeWidget("Europe/Paris", small_screen=False).data_bind(time=DashboardScreen.time)
-            yield PomodoroWidget(small_screen=False).data_bind(time=DashboardScreen.time)
-            yield ObsidianWidget(small_screen=False).data_bind(time=DashboardScreen.time)
+            yield WeatherWidget(small_screen=False)
+            yield TimeWidget("Europe/Paris", small_screen=False)
+            yield PomodoroWidget(small_screen=False)
+            yield ObsidianWidget(small_screen=False)
 
         yield Footer()
 
     def update_time(self) -> None:
         self.time = datetime.now()
+        self.scheduler.tick(self.time)
 
+    @timed("mount")
     def on_mount(self) -> None:
         logger.debug("DashboardApp mounted")
+        for widget in self.query("*"):
+            every = getattr(widget, "TICK_EVERY", None)
+            if every:
+                self.scheduler.register(widget.tick, every)
         self.update_time()
         self.set_interval(1, self.update_time)
+        self.prefetch_weather()
+        self.set_interval(WEATHER_PREFETCH_INTERVAL, self.prefetch_weather)
+
+    def prefetch_weather(self) -> None:
+        """Keep the weather screen's reports cached while on the dashboard."""
+        self.run_worker(prefetch_weather_reports,
+                        group="weather_prefetch", exclusive=True)
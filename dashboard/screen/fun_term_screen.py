@@ -1,11 +1,13 @@
 
 from textual.app import ComposeResult, Screen
 from textual.widgets import Footer
-from dashboard.logger import logger
+from dashboard.logger import get_logger
 from textual.reactive import reactive
 from datetime import datetime
 from textual_terminal import Terminal
 
+logger = get_logger(__name__)
+
 
 class FunTermScreen(Screen):
     time: reactive[datetime] = reactive(datetime.now)
@@ -0,0 +1,124 @@
+from dashboard.utils import BUCKET_BOUNDS_MS, Histogram, perf
+from textual.app import ComposeResult, Screen
+from textual.containers import VerticalScroll
+from textual.widgets import Footer, Static, Button
+from dashboard.logger import get_logger
+
+from rich.table import Table
+import time
+
+logger = get_logger(__name__)
+
+# How often (seconds) the tables are redrawn
+REFRESH_INTERVAL = 1
+# How often (seconds) the event loop is sampled for lag
+LAG_INTERVAL = 0.1
+
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+TITLES = {
+    "compose": "Compose",
+    "mount": "Mount",
+    "tick": "Scheduled ticks",
+    "update": "Widget updates",
+    "http": "Outbound calls",
+    "loop": "Event loop",
+}
+
+
+def sparkline(histogram: Histogram) -> str:
+    """One character per latency bucket, from 1ms to over 5s."""
+    peak = max(histogram.buckets)
+    if not peak:
+        return " " * len(histogram.buckets)
+    return "".join(SPARK_CHARS[round(count / peak * (len(SPARK_CHARS) - 1))]
+                   for count in histogram.buckets)
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
+
+
+def stats_table(kind: str, stats: dict[str, Histogram]) -> Table:
+    table = Table(title=TITLES.get(kind, kind), expand=True, title_justify="left")
+    table.add_column("Name", ratio=3)
+    for column in ("Count", "Last ms", "Mean ms", "p95 ms", "Max ms", "Errors"):
+        table.add_column(column, justify="right")
+    table.add_column(f"{BUCKET_BOUNDS_MS[0]}ms → >{BUCKET_BOUNDS_MS[-1] // 1000}s")
+    for name, histogram in sorted(stats.items(), key=lambda item: -item[1].total):
+        table.add_row(name, str(histogram.count), ms(histogram.last), ms(histogram.mean),
+                      ms(histogram.quantile(0.95)), ms(histogram.max),
+                      str(histogram.errors or ""), sparkline(histogram))
+    return table
+
+
+def hits_table(counters: dict) -> Table:
+    table = Table(title="Unchanged payloads", expand=True, title_justify="left")
+    table.add_column("Name", ratio=3)
+    for column in ("Hits", "Misses", "Hit rate"):
+        table.add_column(column, justify="right")
+    for name, stats in counters.items():
+        table.add_row(name, str(stats.hits), str(stats.misses), f"{stats.hit_rate:.0%}")
+    return table
+
+
+class PerfScreen(Screen):
+    """Where the time goes: compose and mount durations, scheduled ticks,
+    widget updates, outbound calls and event loop lag, and how many polls
+    found nothing new.
+    Collection of the hot paths is only switched on while this screen is
+    shown (or always, with --perf)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.last_sample = None
+
+    def compose(self) -> ComposeResult:
+        with VerticalScroll():
+            for kind in TITLES:
+                yield Static("", id=f"perf-{kind}")
+            yield Static("", id="perf-hits")
+        yield Button("Reset", id="reset")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.query_one(VerticalScroll).border_title = "Performance"
+        self.refresh_timer = self.set_interval(
+            REFRESH_INTERVAL, self.show_stats, pause=True)
+        self.lag_timer = self.set_interval(
+            LAG_INTERVAL, self.sample_lag, pause=True)
+
+    def on_screen_resume(self) -> None:
+        perf.enabled = True
+        self.last_sample = None
+        self.lag_timer.resume()
+        self.refresh_timer.resume()
+        self.show_stats()
+
+    def on_screen_suspend(self) -> None:
+        perf.enabled = perf.keep_enabled
+        self.lag_timer.pause()
+        self.refresh_timer.pause()
+
+    def on_button_pressed(self, event) -> None:
+        if event.button.id == "reset":
+            logger.info("Resetting performance stats")
+            perf.reset()
+            self.show_stats()
+
+    def sample_lag(self) -> None:
+        """Record how late this timer fires: time the loop spent busy elsewhere."""
+        now = time.perf_counter()
+        if self.last_sample is not None:
+            perf.record("loop", "lag", max(
+                0.0, now - self.last_sample - LAG_INTERVAL))
+        self.last_sample = now
+
+    def show_stats(self) -> None:
+        snapshot = perf.snapshot()
+        for kind in TITLES:
+            stats = snapshot.get(kind)
+            self.query_one(f"#perf-{kind}", Static).update(
+                stats_table(kind, stats) if stats else f"{TITLES[kind]}: no data yet")
+        self.query_one("#perf-hits", Static).update(
+            hits_table(perf.hit_counters) if perf.hit_counters else "Unchanged payloads: no data yet")
@@ -1,12 +1,59 @@
-from dashboard.utils import get_city, get_weather_report
+from dashboard.utils import (get_city_async, get_weather_reports_async, peek_city, peek_weather_report,
+                             payload_hash, WEATHER_REPORT_VERSIONS, timed)
 from textual.app import ComposeResult, Screen
 from textual.containers import Horizontal
 from textual.widgets import Footer, RichLog, Button
-from dashboard.logger import logger
+from dashboard.logger import get_logger
 
 from rich.text import Text
+from dataclasses import dataclass
 from itertools import cycle
 
+logger = get_logger(__name__)
+
+
+@dataclass
+class ParsedReport:
+    """A wttr.in report split and parsed into Rich objects, ready to display."""
+    title: str
+    subtitle: Text
+    body: Text
+
+
+def parse_report(report: str | None) -> ParsedReport:
+    """Parse a raw ANSI report: first and last lines become the border title
+    and subtitle, the rest the body."""
+    if report:
+        lines = report.splitlines()
+        if len(lines) >= 2:
+            return ParsedReport(lines[0], Text.from_ansi(lines[-1]),
+                                Text.from_ansi("\n".join(lines[1:-1])))
+        # Handle cases where report is too short, e.g., "Invalid weather API version"
+        return ParsedReport("Weather Report", Text.from_ansi("Information available below."),
+                            Text.from_ansi(report))
+    return ParsedReport("Weather Data Error", Text.from_ansi("Could not load weather information."),
+                        Text("Failed to retrieve weather data. Please check your internet connection or try again later."))
+
+
+# Parsed reports per (city, version), with the hash of the raw report they
+# were parsed from: a refetch returning the same report is not parsed again.
+_parsed_reports: dict[tuple[str, int], tuple[bytes, ParsedReport]] = {}
+
+
+def get_parsed_report(city: str, version: int) -> tuple[bytes, ParsedReport] | None:
+    """Return the hash of the cached report and the report parsed, fresh or
+    stale, without any network access. The ANSI payload is only parsed once
+    per distinct report."""
+    entry = peek_weather_report(city, version)
+    if entry is None:
+        return None
+    digest = payload_hash(entry.value or "")
+    parsed = _parsed_reports.get((city, version))
+    if parsed is None or parsed[0] != digest:
+        parsed = (digest, parse_report(entry.value))
+        _parsed_reports[(city, version)] = parsed
+    return parsed
+
 
 class WeatherScreen(Screen):
 
@@ -17,54 +64,93 @@ class WeatherScreen(Screen):
         if self.small_screen:
             self.add_class("small-screen")
         logger.info(
-            f"WeatherScreen initialized with small_screen={self.small_screen}")
-        self.city = get_city()
-        self.version_cycle = cycle([1, 2, 3])
-        self.display_content = ""  # Content to be displayed in RichLog
-
-        initial_report = get_weather_report(
-            self.city, next(self.version_cycle))
-
-        if initial_report:
-            lines = initial_report.splitlines()
-            if len(lines) >= 2:
-                self.BORDER_TITLE = lines[0]
-                self.BORDER_SUBTITLE = Text.from_ansi(lines[-1])
-                self.display_content = "\n".join(lines[1:-1])
-            else:
-                # Handle cases where report is too short, e.g., "Invalid weather API version"
-                self.BORDER_TITLE = "Weather Report"
-                self.BORDER_SUBTITLE = Text.from_ansi(
-                    "Information available below.")
-                self.display_content = initial_report  # Display the full short report
-        else:
-            self.display_content = "Failed to retrieve weather data. Please check your internet connection or try again later."
-            self.BORDER_TITLE = "Weather Data Error"
-            self.BORDER_SUBTITLE = Text.from_ansi(
-                "Could not load weather information.")
+            "WeatherScreen initialized with small_screen=%s", self.small_screen)
+        # The last known city and its cached reports are shown once mounted,
+        # then checked and refreshed in a worker, so switching to this mode
+        # never waits on the network
+        self.city = None
+        self.city_checked = False
+        self.version_cycle = cycle(WEATHER_REPORT_VERSIONS)
+        self.version = next(self.version_cycle)
+        self.refreshing = False
+        self.shown = None  # (city, version, report hash) displayed
+        self.BORDER_TITLE = "Weather Report"
+        self.BORDER_SUBTITLE = "Loading..."
+
+    @timed("mount")
+    def on_mount(self) -> None:
+        self.city = peek_city()
+        self.refresh_reports()
+        self.show_version(revalidate=False)
 
     def on_button_pressed(self, event) -> None:
         if event.button.id == "version":
-            version = next(self.version_cycle)
-            new_report = get_weather_report(self.city, version)
-            rich_log = self.query_one(RichLog)
-            rich_log.clear()
-            if new_report:
-                lines = new_report.splitlines()
-                if len(lines) >= 2:
-                    # Update the content of the RichLog, but not the screen's border title/subtitle
-                    rich_log.write(Text.from_ansi(
-                        "\n".join(lines[1:-1])), scroll_end=False)
-                else:
-                    rich_log.write(Text.from_ansi(
-                        new_report), scroll_end=False)
-            else:
-                rich_log.write(
-                    "Failed to retrieve weather data. Please check your internet connection or try again later.", scroll_end=False)
+            self.version = next(self.version_cycle)
+            # All versions are cached together, cycling is an in-memory swap
+            self.show_version()
+
+    def refresh_reports(self) -> None:
+        """Fetch every report version in the background, unless already doing so."""
+        if not self.refreshing:
+            self.refreshing = True
+            self.run_worker(self._refresh_reports,
+                            group="weather_report", exclusive=True)
+
+    async def _refresh_reports(self) -> None:
+        try:
+            if not self.city_checked:
+                self.city = await get_city_async()
+                self.city_checked = True
+            # Render what is cached right away, even stale
+            if self.show_version(revalidate=False):
+                return
+            await get_weather_reports_async(self.city)
+        finally:
+            self.refreshing = False
+        self.show_version(revalidate=False)
+
+    @timed("update")
+    def show_version(self, revalidate: bool = True) -> bool:
+        """Display the current version from the parsed cache.
+
+        Returns whether every version is cached and fresh; otherwise, with
+        `revalidate`, a background refresh is started.
+        """
+        if self.city is None:
+            return False
+        all_fresh = all(
+            (entry := peek_weather_report(self.city, version)) is not None and entry.is_fresh
+            for version in WEATHER_REPORT_VERSIONS)
+        if not all_fresh and revalidate:
+            self.refresh_reports()
+        parsed = get_parsed_report(self.city, self.version)
+        shown = (self.city, self.version, parsed[0] if parsed else self.refreshing)
+        if shown == self.shown:
+            # Same report already displayed, keep the scroll position
+            return all_fresh
+        self.shown = shown
+        rich_log = self.query_one(RichLog)
+        rich_log.clear()
+        if parsed is None:
+            if self.refreshing:
+                rich_log.write("Loading weather report...", scroll_end=False)
+                return all_fresh
+            report = parse_report(None)
+        else:
+            report = parsed[1]
+        if self.version == 1:
+            self.border_title = report.title
+            self.border_subtitle = report.subtitle
+        rich_log.write(report.body, scroll_end=False)
+        return all_fresh
+
+    def on_unmount(self) -> None:
+        self.workers.cancel_group(self, "weather_report")
 
+    @timed("compose")
     def compose(self) -> ComposeResult:
         yield Horizontal(
-            RichLog().write(Text.from_ansi(self.display_content), scroll_end=False),
+            RichLog().write("Loading weather report...", scroll_end=False),
             Button("Version", id="version")
         )
         yield Footer()
@@ -0,0 +1 @@
+# Local stand-ins for the dashboard's backends, to run and test it offline.
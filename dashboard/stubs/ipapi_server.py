@@ -0,0 +1,77 @@
+"""
+Stand-in for ipapi.co's geolocation, built on the standard library only.
+
+    python -m dashboard.stubs.ipapi_server --port 8002 --city Lille
+
+then run the dashboard with IPAPI_URL=http://127.0.0.1:8002/json/.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import threading
+
+DEFAULT_CITY = "Roubaix"
+
+
+class IpapiStubHandler(BaseHTTPRequestHandler):
+    server: "IpapiStubServer"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        if self.path == "/json/":
+            status, payload = 200, {"ip": "127.0.0.1", "city": self.server.city,
+                                    "country_name": "France"}
+        else:
+            status, payload = 404, {"error": True, "reason": "Not Found"}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class IpapiStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], city: str = DEFAULT_CITY) -> None:
+        super().__init__(address, IpapiStubHandler)
+        self.city = city
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        """Value for IPAPI_URL."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/json/"
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **kwargs) -> IpapiStubServer:
+    """Start the stub in a background thread; port 0 picks a free port."""
+    server = IpapiStubServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Stand-in ipapi.co for running the dashboard offline")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--city", default=DEFAULT_CITY)
+    args = parser.parse_args()
+
+    server = IpapiStubServer((args.host, args.port), city=args.city)
+    print(f"ipapi.co stub serving on {server.url} (city: {args.city})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Stand-in for the Obsidian FastAPI backend, built on the standard library only.
+
+Serves the endpoints the dashboard uses (daily note, todo list, their updates)
+with ETags, plus a server-sent events stream at /events announcing changes.
+Latency and failures (503) can be injected, to exercise the client's timeouts
+and circuit breaker: set with the options below, or on the server object
+(`latency`, `failure_rate`, `down`) while it runs.
+
+    python -m dashboard.stubs.obsidian_server --port 8000 --latency 0.5 --failure-rate 0.2
+
+then run the dashboard with API_URL=http://127.0.0.1:8000 and API_KEY=dev.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+DEFAULT_API_KEY = "dev"
+HEARTBEAT_INTERVAL = 15  # seconds between keep-alive comments on /events
+
+DEFAULT_DAILY_TODO = """- [ ] Review pull requests
+- [x] Morning run
+- [ ] Write the weekly report
+"""
+
+DEFAULT_TODO = """- [ ] Fix the bike
+- [ ] Book the train tickets
+- [x] Call the plumber
+"""
+
+
+class NotesState:
+    """The notes served by the stub; every change is announced on /events."""
+
+    def __init__(self) -> None:
+        self.routine = {
+            "journal_wrote": True,
+            "wake_early": False,
+            "trained": True,
+            "stretched": False,
+            "anki": True,
+            "city": "Roubaix",
+        }
+        self.daily_todos: dict[str, str] = {}
+        self.todo = DEFAULT_TODO
+        self.version = 0
+        self.last_change = None
+        self.changed = threading.Condition()
+
+    def daily(self, date: str) -> dict:
+        return {"date": date, "routine": self.routine,
+                "daily_todo": self.daily_todos.get(date, DEFAULT_DAILY_TODO)}
+
+    def notify(self, kind: str) -> None:
+        with self.changed:
+            self.version += 1
+            self.last_change = kind
+            self.changed.notify_all()
+
+    def set_daily_todo(self, date: str, daily_todo: str) -> None:
+        self.daily_todos[date] = daily_todo
+        self.notify("daily")
+
+    def set_todo(self, todo: str) -> None:
+        self.todo = todo
+        self.notify("todo")
+
+
+class ObsidianStubHandler(BaseHTTPRequestHandler):
+    server: "ObsidianStubServer"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _authorized(self) -> bool:
+        if self.headers.get("X-API-KEY") == self.server.api_key:
+            return True
+        self._send_json({"detail": "Invalid API key"}, status=401)
+        return False
+
+    def _send_json(self, payload: dict, status: int = 200) -> None:
+        body = json.dumps(payload).encode()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _inject_faults(self) -> bool:
+        """Delay the request by the injected latency, then fail it when the
+        server is down or by chance. Returns whether it failed."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.down or random.random() < self.server.failure_rate:
+            self._send_json({"detail": "Injected failure"}, status=503)
+            return True
+        return False
+
+    def do_GET(self) -> None:
+        if self._inject_faults() or not self._authorized():
+            return
+        state = self.server.state
+        if match := re.fullmatch(r"/daily/(\d{4}-\d{2}-\d{2})", self.path):
+            self._send_json(state.daily(match.group(1)))
+        elif self.path == "/to_do_list":
+            self._send_json({"todo_list": state.todo})
+        elif self.path == "/events":
+            self._stream_events()
+        else:
+            self._send_json({"detail": "Not Found"}, status=404)
+
+    def do_POST(self) -> None:
+        if self._inject_faults() or not self._authorized():
+            return
+        state = self.server.state
+        if match := re.fullmatch(r"/daily/(\d{4}-\d{2}-\d{2})/update_todo", self.path):
+            state.set_daily_todo(match.group(1), self._read_json()["daily_todo"])
+            self._send_json({"status": "ok"})
+        elif self.path == "/to_do_list/update":
+            state.set_todo(self._read_json()["todo"])
+            self._send_json({"status": "ok"})
+        else:
+            self._send_json({"detail": "Not Found"}, status=404)
+
+    def _stream_events(self) -> None:
+        state = self.server.state
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        with state.changed:
+            seen = state.version
+        try:
+            while not self.server.closing:
+                with state.changed:
+                    state.changed.wait_for(
+                        lambda: state.version != seen or self.server.closing,
+                        timeout=self.server.heartbeat_interval)
+                    version, kind = state.version, state.last_change
+                if version != seen:
+                    seen = version
+                    payload = json.dumps({"version": version})
+                    self.wfile.write(
+                        f"event: {kind}\ndata: {payload}\n\n".encode())
+                else:
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class ObsidianStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], api_key: str = DEFAULT_API_KEY,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL, latency: float = 0.0,
+                 failure_rate: float = 0.0) -> None:
+        super().__init__(address, ObsidianStubHandler)
+        self.api_key = api_key
+        self.heartbeat_interval = heartbeat_interval
+        self.latency = latency  # seconds added to every request
+        self.failure_rate = failure_rate  # share of requests failing with a 503
+        self.down = False  # every request fails with a 503
+        self.state = NotesState()
+        self.closing = False
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def shutdown(self) -> None:
+        self.closing = True
+        with self.state.changed:
+            self.state.changed.notify_all()
+        super().shutdown()
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **kwargs) -> ObsidianStubServer:
+    """Start the stub in a background thread; port 0 picks a free port."""
+    server = ObsidianStubServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Stand-in Obsidian API for running the dashboard offline")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds added to every request")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Share of requests failing with a 503, from 0 to 1")
+    args = parser.parse_args()
+
+    server = ObsidianStubServer((args.host, args.port), api_key=args.api_key,
+                                latency=args.latency, failure_rate=args.failure_rate)
+    print(f"Obsidian stub serving on {server.url} (API key: {args.api_key}), "
+          f"today is {datetime.now().strftime('%Y-%m-%d')}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
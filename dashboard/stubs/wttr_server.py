@@ -0,0 +1,143 @@
+"""
+Stand-in for wttr.in, built on the standard library only.
+
+Serves the structured data (?format=j1), the current conditions (?0Q), the
+one line summary (?format=3) and the full reports (?F). Report versions are
+selected by path (/v2/Roubaix) instead of by subdomain (v2.wttr.in).
+
+    python -m dashboard.stubs.wttr_server --port 8001
+
+then run the dashboard with WTTR_URL=http://127.0.0.1:8001 and
+WTTR_REPORT_URL=http://127.0.0.1:8001/v{version}.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+from datetime import date, timedelta
+import argparse
+import json
+import re
+import threading
+
+YELLOW = "\x1b[38;5;226m"
+BLUE = "\x1b[38;5;111m"
+RESET = "\x1b[0m"
+
+CURRENT = f"""{YELLOW}    \\   /    {RESET} Ensoleillé
+{YELLOW}     .-.     {RESET} {BLUE}+18{RESET}(17) °C
+{YELLOW}  ― (   ) ―  {RESET} ↗ 12 km/h
+{YELLOW}     `-'     {RESET} 10 km
+{YELLOW}    /   \\    {RESET} 0.0 mm"""
+
+
+def current_conditions(city: str) -> str:
+    return CURRENT
+
+
+def j1(city: str) -> dict:
+    """wttr.in's JSON, with the fields the dashboard reads and a few more."""
+    today = date.today()
+    return {
+        "current_condition": [{
+            "FeelsLikeC": "17", "temp_C": "18", "weatherCode": "113",
+            "weatherDesc": [{"value": "Sunny"}], "lang_fr": [{"value": "Ensoleillé"}],
+            "windspeedKmph": "12", "winddirDegree": "225", "winddir16Point": "SW",
+            "visibility": "10", "precipMM": "0.0", "humidity": "55", "pressure": "1018",
+        }],
+        "nearest_area": [{"areaName": [{"value": city}], "country": [{"value": "France"}]}],
+        "weather": [{
+            "date": (today + timedelta(days=day)).isoformat(),
+            "maxtempC": str(20 + day), "mintempC": str(9 + day), "avgtempC": str(15 + day),
+            "hourly": [{"time": str(hour * 300), "tempC": str(12 + hour),
+                        "weatherCode": "116" if day else "113"} for hour in range(8)],
+        } for day in range(3)],
+    }
+
+
+def minimal(city: str) -> str:
+    return f"{city}: ☀️   +18°C\n"
+
+
+def report(city: str, version: int) -> str:
+    """A multi-line report shaped like wttr.in's: title, body, location line."""
+    days = "\n\n".join(
+        f"{'─' * 30} Jour {day} {'─' * 30}\n{CURRENT}" for day in range(1, 4))
+    return (f"Prévisions météo pour: {city} (v{version})\n\n{CURRENT}\n\n{days}\n\n"
+            f"Emplacement: {city}, France [50.69,3.17]")
+
+
+class WttrStubHandler(BaseHTTPRequestHandler):
+    server: "WttrStubServer"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_text(self, text: str, status: int = 200,
+                   content_type: str = "text/plain; charset=utf-8") -> None:
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        url = urlsplit(self.path)
+        if match := re.fullmatch(r"/v(\d)/([^/]+)", url.path):
+            self._send_text(report(unquote(match.group(2)), int(match.group(1))))
+        elif match := re.fullmatch(r"/([^/]+)", url.path):
+            city = unquote(match.group(1))
+            if "format=j1" in url.query:
+                self._send_text(json.dumps(j1(city)), content_type="application/json")
+            elif "format=3" in url.query:
+                self._send_text(minimal(city))
+            else:
+                self._send_text(current_conditions(city))
+        else:
+            self._send_text("Not Found", status=404)
+
+
+class WttrStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int]) -> None:
+        super().__init__(address, WttrStubHandler)
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def report_url(self) -> str:
+        """Value for WTTR_REPORT_URL."""
+        return self.url + "/v{version}"
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0) -> WttrStubServer:
+    """Start the stub in a background thread; port 0 picks a free port."""
+    server = WttrStubServer((host, port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Stand-in wttr.in for running the dashboard offline")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    server = WttrStubServer((args.host, args.port))
+    print(f"wttr.in stub serving on {server.url}, "
+          f"reports on {server.report_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
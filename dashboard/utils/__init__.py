@@ -1,4 +1,16 @@
+from .perf import *
+from .http_client import *
+from .singleflight import *
+from .circuit_breaker import *
+from .cache import *
+from .snapshot import *
+from .geolocation import *
+from .weather_render import *
 from .weather import *
 from .sound import *
 from .text import *
+from .scheduler import *
 from .globals import *
+from .obsidian import *
+from .todo import *
+from .todo_uploads import *
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from pathlib import Path
+import json
+import os
+import tempfile
+import threading
+import time
+from dashboard.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_cache_dir() -> Path:
+    """Directory holding the dashboard's on-disk caches.
+
+    DASHBOARD_CACHE_DIR overrides the default $XDG_CACHE_HOME/dashboard.
+    """
+    if os.getenv("DASHBOARD_CACHE_DIR"):
+        return Path(os.environ["DASHBOARD_CACHE_DIR"])
+    xdg_cache = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / "dashboard"
+
+
+@dataclass
+class CacheEntry:
+    value: object
+    fetched_at: float  # wall clock (time.time()), so it survives restarts
+    ttl: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.age < self.ttl
+
+
+class ResponseCache:
+    """A small TTL cache of JSON-serialisable values, persisted to one JSON file.
+
+    Entries are kept after they expire so callers can render stale data while
+    they revalidate (see `CacheEntry.is_fresh`). The file is loaded on first
+    access and rewritten atomically on every `set`.
+    """
+
+    def __init__(self, path: Path, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._entries: dict[str, CacheEntry] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(key: tuple) -> str:
+        return "|".join(str(part) for part in key)
+
+    def _load(self) -> dict[str, CacheEntry]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                raw = json.loads(self.path.read_text())
+                for key, (value, fetched_at) in raw.items():
+                    self._entries[key] = CacheEntry(value, fetched_at, self.ttl)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning("Ignoring unreadable cache %s: %s", self.path, e)
+        return self._entries
+
+    def _save(self) -> None:
+        raw = {key: (entry.value, entry.fetched_at)
+               for key, entry in self._entries.items()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(raw, tmp_file, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Failed to persist cache %s: %s", self.path, e)
+
+    def get(self, key: tuple) -> CacheEntry | None:
+        """Return the entry for `key`, fresh or stale, or None if never cached."""
+        with self._lock:
+            return self._load().get(self._key(key))
+
+    def set(self, key: tuple, value) -> None:
+        with self._lock:
+            self._load()[self._key(key)] = CacheEntry(
+                value, time.time(), self.ttl)
+            self._save()
@@ -0,0 +1,87 @@
+from dashboard.logger import get_logger
+from typing import Callable
+import random
+import threading
+import time
+
+logger = get_logger(__name__)
+
+# Consecutive failures opening the circuit
+FAILURE_THRESHOLD = 3
+# Delays (seconds) before probing an open circuit, doubled after each failed
+# probe, with +/-20% jitter so clients don't probe in lockstep
+MIN_PROBE_DELAY = 5
+MAX_PROBE_DELAY = 5 * 60
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend that is known to be down."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a backend after FAILURE_THRESHOLD consecutive failures.
+
+    While open, `allow` refuses every call until the probe delay elapsed, then
+    lets a single call through (half-open): its success closes the circuit,
+    its failure opens it again for twice as long, up to MAX_PROBE_DELAY.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 min_delay: float = MIN_PROBE_DELAY, max_delay: float = MAX_PROBE_DELAY,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.delay = min_delay
+        self.probe_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next probe, 0 unless open."""
+        return max(0.0, self.probe_at - self.clock()) if self.state == OPEN else 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may go through now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() >= self.probe_at:
+                self.state = HALF_OPEN  # This call is the probe
+                return True
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("%s is back, closing its circuit", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self.delay = self.min_delay
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state == HALF_OPEN:
+                    self.delay = min(self.delay * 2, self.max_delay)
+                delay = self.delay * random.uniform(0.8, 1.2)
+                self.state = OPEN
+                self.probe_at = self.clock() + delay
+                logger.warning("%s is down (%s failures), next try in %.0fs",
+                               self.name, self.failures, delay)
+
+    def check(self) -> None:
+        """Raises CircuitOpenError unless a call may go through now."""
+        if not self.allow():
+            raise CircuitOpenError(
+                f"{self.name} is down, next try in {self.retry_in:.0f}s")
@@ -0,0 +1,105 @@
+from dashboard.logger import get_logger
+from dashboard.utils.cache import ResponseCache, get_cache_dir
+from dashboard.utils.http_client import http_get
+from dashboard.utils.singleflight import SingleFlight
+import asyncio
+import os
+import time
+
+logger = get_logger(__name__)
+
+DEFAULT_CITY = "Roubaix"
+
+# Overridable with the IPAPI_URL environment variable,
+# e.g. to run against dashboard.stubs.ipapi_server
+DEFAULT_IPAPI_URL = "https://ipapi.co/json/"
+
+# The resolved city is persisted and reused across restarts for this long
+# (seconds), overridable with the GEOLOCATION_CACHE_TTL environment variable
+DEFAULT_GEOLOCATION_CACHE_TTL = 7 * 24 * 3600
+# After a failed lookup, callers get the fallback without a new request
+# for this long (seconds)
+GEOLOCATION_RETRY_INTERVAL = 5 * 60
+
+_CITY_KEY = ("city",)
+
+_geolocation_cache: ResponseCache | None = None
+_failed_at: float | None = None
+# Concurrent callers wait for the one lookup in flight instead of starting
+# their own
+_lookups = SingleFlight()
+
+
+def _get_geolocation_cache() -> ResponseCache:
+    global _geolocation_cache
+    if _geolocation_cache is None:
+        ttl = float(os.getenv("GEOLOCATION_CACHE_TTL",
+                    DEFAULT_GEOLOCATION_CACHE_TTL))
+        _geolocation_cache = ResponseCache(
+            get_cache_dir() / "geolocation.json", ttl)
+    return _geolocation_cache
+
+
+def _lookup_city() -> str | None:
+    """Ask ipapi.co for the city of the current public IP."""
+    try:
+        logger.info("Looking up city from ipapi.co")
+        response = http_get(os.getenv("IPAPI_URL", DEFAULT_IPAPI_URL))
+        if response.status_code == 200:
+            return response.json().get('city') or None
+        logger.error(
+            "Error fetching city name status code: %s", response.status_code)
+    except Exception as e:
+        logger.error("Error fetching city name: %s", e)
+    return None
+
+
+def get_city(default_city: str = DEFAULT_CITY) -> str:
+    """Return the city name for the current position.
+
+    The DASHBOARD_CITY environment variable takes precedence over any lookup.
+    Otherwise the result of a single ipapi.co lookup is memoized in memory and
+    on disk, and shared by every caller.
+    Returns:
+        str: The city name or default_city if it cannot be determined.
+    """
+    override = os.getenv("DASHBOARD_CITY")
+    if override:
+        return override
+    entry = _get_geolocation_cache().get(_CITY_KEY)
+    if entry is not None and entry.is_fresh:
+        return entry.value
+    return _lookups.do(_CITY_KEY, lambda: _resolve_city(default_city))
+
+
+def _resolve_city(default_city: str) -> str:
+    global _failed_at
+    cache = _get_geolocation_cache()
+    entry = cache.get(_CITY_KEY)
+    if entry is not None and entry.is_fresh:
+        return entry.value
+    if _failed_at is not None and time.monotonic() - _failed_at < GEOLOCATION_RETRY_INTERVAL:
+        return entry.value if entry is not None else default_city
+    city = _lookup_city()
+    if city is None:
+        _failed_at = time.monotonic()
+        # A stale city is still a better guess than the default
+        return entry.value if entry is not None else default_city
+    _failed_at = None
+    cache.set(_CITY_KEY, city)
+    return city
+
+
+def peek_city() -> str | None:
+    """Return the city to render with right away, without any request:
+    DASHBOARD_CITY, or the last lookup even when stale. None if never looked up."""
+    override = os.getenv("DASHBOARD_CITY")
+    if override:
+        return override
+    entry = _get_geolocation_cache().get(_CITY_KEY)
+    return entry.value if entry is not None else None
+
+
+async def get_city_async(default_city: str = DEFAULT_CITY) -> str:
+    """Non-blocking version of `get_city`."""
+    return await asyncio.to_thread(get_city, default_city)
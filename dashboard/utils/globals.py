@@ -1,12 +1,35 @@
-from dotenv import load_dotenv
 import os
-from pathlib import Path
 
-load_dotenv()
-# Load environment variables from .env file
+# The .env file and the Obsidian API credentials are loaded on first use,
+# not at import: the rest of the dashboard starts without them
 
-# check that api URL and api key are set
-API_URL = os.getenv("API_URL")
-API_KEY = os.getenv("API_KEY")
-if not API_URL or not API_KEY:
-    raise ValueError("API_URL and API_KEY must be set in the .env file")
+_env_loaded = False
+
+
+class MissingCredentialsError(ValueError):
+    """API_URL or API_KEY is not set."""
+
+
+def load_env() -> None:
+    """Load the .env file into the environment, once. Variables already set
+    in the environment take precedence."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def get_api_credentials() -> tuple[str, str]:
+    """Return the Obsidian API (url, key).
+
+    Raises:
+        MissingCredentialsError: If API_URL or API_KEY is not set.
+    """
+    load_env()
+    api_url = os.getenv("API_URL")
+    api_key = os.getenv("API_KEY")
+    if not api_url or not api_key:
+        raise MissingCredentialsError(
+            "API_URL and API_KEY must be set in the .env file")
+    return api_url, api_key
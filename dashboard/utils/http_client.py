@@ -0,0 +1,88 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+import threading
+import time
+from dashboard.utils.perf import perf
+
+if TYPE_CHECKING:
+    # requests (and urllib3, certifi...) is only imported by the first
+    # request, which runs in a worker: it stays off the startup path
+    import requests
+
+# (connect, read) timeouts in seconds, so a slow or dead backend can never
+# hang a fetch for the whole OS TCP timeout
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+REQUEST_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# One pool per host (wttr.in, ipapi.co, the Obsidian API...), a few
+# keep-alive connections each so parallel fetches don't queue up
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 4
+
+_session: "requests.Session | None" = None
+_session_lock = threading.Lock()
+_executor = ThreadPoolExecutor(
+    max_workers=POOL_MAXSIZE, thread_name_prefix="dashboard-http")
+
+
+def get_session() -> "requests.Session":
+    """Return the shared keep-alive session, creating it on first use.
+
+    Reusing it across calls avoids a new TCP + TLS handshake per request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def _request(method: str, url: str, **kwargs) -> "requests.Response":
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    if not perf.enabled:
+        return get_session().request(method, url, **kwargs)
+    # Latency per host, up to the response headers for streamed requests
+    start = time.perf_counter()
+    error = True
+    try:
+        response = get_session().request(method, url, **kwargs)
+        error = response.status_code >= 400
+        return response
+    finally:
+        perf.record("http", urlsplit(url).hostname or url,
+                    time.perf_counter() - start, error)
+
+
+def http_get(url: str, **kwargs) -> "requests.Response":
+    """GET through the shared session, with REQUEST_TIMEOUT unless overridden."""
+    return _request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> "requests.Response":
+    """POST through the shared session, with REQUEST_TIMEOUT unless overridden."""
+    return _request("POST", url, **kwargs)
+
+
+def http_submit(url: str, **kwargs) -> "Future[requests.Response]":
+    """Start a GET on the shared pool and return its future."""
+    return _executor.submit(http_get, url, **kwargs)
+
+
+def http_get_many(*urls: str, **kwargs) -> "list[requests.Response]":
+    """GET several URLs concurrently over the shared pool.
+
+    The keyword arguments are passed to every request. Responses are returned
+    in the order of `urls`; the first request exception is re-raised.
+    """
+    futures = [http_submit(url, **kwargs) for url in urls]
+    return [future.result() for future in futures]
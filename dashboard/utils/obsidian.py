@@ -0,0 +1,312 @@
+import logging
+from dashboard.logger import get_logger
+from dashboard.utils.circuit_breaker import CLOSED, CircuitBreaker
+from dashboard.utils.globals import get_api_credentials
+from dashboard.utils.http_client import CONNECT_TIMEOUT, http_get, http_post, http_submit
+from dashboard.utils.perf import perf
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import json
+import threading
+import time
+
+if TYPE_CHECKING:
+    import requests
+
+logger = get_logger(__name__)
+
+# The backend sends a comment at least this often (seconds) on the events
+# stream, a longer silence means the connection is dead
+STREAM_HEARTBEAT_TIMEOUT = 45
+# Reconnection delays (seconds) after the stream drops; a backend without an
+# events endpoint is only retried every STREAM_UNAVAILABLE_RETRY
+STREAM_MIN_RETRY = 1
+STREAM_MAX_RETRY = 60
+STREAM_UNAVAILABLE_RETRY = 5 * 60
+
+# Daily notes kept in memory, so moving between days renders at once
+DAILY_CACHE_SIZE = 15
+
+
+@dataclass
+class PollStats:
+    """Counts polls whose payload was unchanged (hits) or changed (misses)."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def is_outage(error: "requests.RequestException") -> bool:
+    """Whether an error means the backend is down: no response (connection
+    failure, timeout) or a server error. A 4xx comes from a live backend."""
+    response = getattr(error, "response", None)
+    return response is None or response.status_code >= 500
+
+
+class ObsidianClient:
+    """Client for the Obsidian FastAPI backend (daily note and todo list).
+
+    Polls are conditional: ETags are sent back as If-None-Match when the
+    server provides them, and the payloads are hashed, so `fetch` can tell
+    the caller that nothing changed before any parsing or widget work.
+
+    Every request has connect and read timeouts, and goes through a circuit
+    breaker: once the backend is found down, calls fail at once instead of
+    waiting on it, until a probe finds it back.
+
+    The last DAILY_CACHE_SIZE daily notes fetched, or prefetched, are kept
+    in memory (see `peek`), the least recently used dropped first.
+    """
+
+    def __init__(self, api_url: str | None = None, api_key: str | None = None) -> None:
+        """Raises MissingCredentialsError when no credentials are given and
+        none are configured."""
+        if api_url is None or api_key is None:
+            api_url, api_key = get_api_credentials()
+        self.api_url = api_url
+        self.headers = {"X-API-KEY": api_key}
+        self.stats = PollStats()
+        perf.watch_hits("Obsidian polls", self.stats)
+        self.breaker = CircuitBreaker("Obsidian API")
+        self.last_success: float | None = None  # Wall clock of the last fetch that succeeded
+        self._etags: dict[str, tuple[str, bytes]] = {}  # url -> (etag, body)
+        self._last_hashes: dict[str, str] = {}  # date -> hash of the payload last returned
+        self._daily: OrderedDict[str, dict] = OrderedDict()  # date -> daily note
+        self._todo: str | None = None
+        self._lock = threading.Lock()  # Held by fetch, for the whole fetch
+        self._cache_lock = threading.Lock()  # Held briefly, peek must not wait on a fetch
+
+    def _daily_url(self, date: str) -> str:
+        return f"{self.api_url}/daily/{date}"
+
+    def _remember(self, date: str, daily: dict) -> None:
+        with self._cache_lock:
+            self._daily[date] = daily
+            self._daily.move_to_end(date)
+            if len(self._daily) > DAILY_CACHE_SIZE:
+                evicted, _ = self._daily.popitem(last=False)
+                self._etags.pop(self._daily_url(evicted), None)
+                self._last_hashes.pop(evicted, None)
+
+    def peek(self, date: str) -> dict | None:
+        """The daily note of `date` merged with the todo list, from memory
+        only; None unless both were fetched."""
+        with self._cache_lock:
+            daily = self._daily.get(date)
+            if daily is None or self._todo is None:
+                return None
+            self._daily.move_to_end(date)
+            return {**daily, "todo": self._todo}
+
+    def _get(self, url: str) -> "tuple[tuple[str, bytes] | None, Future[requests.Response]]":
+        """Request `url`, conditionally when its body is cached. Returns the
+        cached (etag, body) the request relies on, with the response future:
+        prefetch may evict the entry from another thread meanwhile."""
+        headers = dict(self.headers)
+        with self._cache_lock:
+            cached = self._etags.get(url)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+        # the certificate is self certified
+        return cached, http_submit(url, headers=headers, verify=False)
+
+    def _body(self, url: str, cached: tuple[str, bytes] | None,
+              response: "requests.Response") -> bytes:
+        if response.status_code == 304:
+            if cached is not None:
+                return cached[1]
+            # Nothing to reuse, ask for the body itself
+            response = http_get(url, headers=self.headers, verify=False)
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._cache_lock:
+                self._etags[url] = (etag, response.content)
+        return response.content
+
+    def fetch(self, date: str | None = None) -> dict | None:
+        """Fetch the daily note of `date` (YYYY-MM-DD, default today) merged
+        with the todo list.
+
+        Both endpoints are fetched in parallel. Returns None when the payload
+        is identical to the one last returned for this date, and
+        {"error": ...} when the backend could not be reached.
+        """
+        import requests  # Deferred to the first fetch, off the startup path
+
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        daily_url = self._daily_url(date)
+        todo_url = f"{self.api_url}/to_do_list"
+        with self._lock:
+            if not self.breaker.allow():
+                return {"error": f"Backend down, next try in {self.breaker.retry_in:.0f}s"}
+            try:
+                futures = [(url, *self._get(url))
+                           for url in (daily_url, todo_url)]
+                daily_body, todo_body = (self._body(url, cached, future.result())
+                                         for url, cached, future in futures)
+                self.breaker.success()
+                self.last_success = time.time()
+                digest = hashlib.sha1(
+                    daily_body + b"\0" + todo_body).hexdigest()
+                if digest == self._last_hashes.get(date):
+                    self.stats.hits += 1
+                    logger.debug(
+                        "Obsidian data unchanged (%s hits / %s misses)", self.stats.hits, self.stats.misses)
+                    return None
+                daily = json.loads(daily_body)
+                todo = json.loads(todo_body).get("todo_list", "")
+            except (requests.RequestException, ValueError) as e:
+                if isinstance(e, requests.RequestException) and is_outage(e):
+                    self.breaker.failure()
+                else:
+                    self.breaker.success()
+                logger.error(
+                    "Failed to fetch data from FastAPI endpoint: %s", e)
+                # Whatever comes next must be displayed again
+                self._last_hashes.pop(date, None)
+                return {"error": str(e)}
+            self._remember(date, daily)
+            with self._cache_lock:
+                self._todo = todo
+            self.stats.misses += 1
+            self._last_hashes[date] = digest
+            if logger.isEnabledFor(logging.DEBUG):  # Skip decoding the payload otherwise
+                logger.debug("Fetched data from FastAPI endpoint: %s",
+                             daily_body.decode(errors='replace'))
+            return {**daily, "todo": todo}
+
+    def prefetch(self, dates: list[str]) -> None:
+        """Fetch the daily notes of `dates` not in memory yet, in parallel, so
+        they can be peeked. Failures are left to the next fetch. Blocking."""
+        import requests  # Deferred to the first fetch, off the startup path
+
+        if self.breaker.state != CLOSED:
+            return
+        with self._cache_lock:
+            dates = [date for date in dates if date not in self._daily]
+        futures = [(date, url, *self._get(url))
+                   for date, url in ((date, self._daily_url(date)) for date in dates)]
+        for date, url, cached, future in futures:
+            try:
+                self._remember(date, json.loads(self._body(url, cached, future.result())))
+            except (requests.RequestException, ValueError) as e:
+                logger.debug("Failed to prefetch the daily note of %s: %s", date, e)
+
+    def upload_todo(self, target: str, text: str) -> None:
+        """Replace a todo list: "todo", or "daily_todo:<YYYY-MM-DD>" for the
+        one of a daily note. Blocking.
+
+        Raises:
+            CircuitOpenError: If the backend is known to be down.
+            requests.RequestException: If the backend could not be updated.
+        """
+        import requests  # Deferred to the first upload, off the startup path
+
+        self.breaker.check()
+        kind, _, date = target.partition(":")
+        if kind == "daily_todo":
+            url, payload = f"{self.api_url}/daily/{date}/update_todo", {"daily_todo": text}
+        else:
+            url, payload = f"{self.api_url}/to_do_list/update", {"todo": text}
+        try:
+            # the certificate is self certified
+            response = http_post(url, headers=self.headers, json=payload, verify=False)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if is_outage(e):
+                self.breaker.failure()
+            else:
+                self.breaker.success()
+            raise
+        self.breaker.success()
+
+
+class ObsidianSubscription:
+    """Consumes the backend's server-sent events stream (GET /events).
+
+    Every event (e.g. "daily" or "todo") calls `on_change` with its name, and
+    each (re)connection calls it with "connected" so changes missed while
+    disconnected are picked up. While `connected` is False, callers should
+    fall back to polling.
+    """
+
+    def __init__(self, client: ObsidianClient, on_change: Callable[[str], None]) -> None:
+        self.client = client
+        self.on_change = on_change
+        self.connected = False
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Run the subscription in a daemon thread: a read blocked until the
+        next heartbeat must never delay the app's exit."""
+        threading.Thread(target=self.run, name="obsidian-events",
+                         daemon=True).start()
+
+    def stop(self) -> None:
+        """Make `run` return after the current read (at most one heartbeat).
+        Closing the response from another thread would block on its reader."""
+        self._stopped.set()
+
+    def run(self) -> None:
+        """Consume the stream until `stop`, reconnecting with backoff. Blocking."""
+        import requests  # Deferred to the first connection, off the startup path
+
+        retry = STREAM_MIN_RETRY
+        while not self._stopped.is_set():
+            try:
+                self._consume()
+                retry = STREAM_MIN_RETRY
+            except requests.HTTPError as e:
+                if is_outage(e):
+                    logger.warning("Obsidian events stream dropped: %s", e)
+                    retry = min(retry * 2, STREAM_MAX_RETRY)
+                else:
+                    logger.warning(
+                        "Obsidian events stream unavailable (%s), polling instead", e)
+                    retry = STREAM_UNAVAILABLE_RETRY
+            except (requests.RequestException, OSError) as e:
+                logger.warning("Obsidian events stream dropped: %s", e)
+                retry = min(retry * 2, STREAM_MAX_RETRY)
+            finally:
+                self.connected = False
+            self._stopped.wait(retry)
+
+    def _consume(self) -> None:
+        response = http_get(
+            f"{self.client.api_url}/events",
+            headers={**self.client.headers, "Accept": "text/event-stream"},
+            # the certificate is self certified
+            verify=False, stream=True,
+            timeout=(CONNECT_TIMEOUT, STREAM_HEARTBEAT_TIMEOUT))
+        with response:
+            response.raise_for_status()
+            self.connected = True
+            logger.info("Subscribed to Obsidian events stream")
+            self.on_change("connected")
+            event = None
+            # Events are tiny and must be handled as soon as they arrive,
+            # a bigger chunk size would wait for more bytes to buffer
+            for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+                if self._stopped.is_set():
+                    return
+                if not line:
+                    # A blank line dispatches the event, "data:" only carries
+                    # the new version, the notes are fetched by the caller
+                    if event is not None:
+                        self.on_change(event)
+                    event = None
+                elif line.startswith(":"):
+                    continue  # heartbeat
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:") and event is None:
+                    event = "message"
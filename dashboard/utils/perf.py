@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+from typing import Callable
+import functools
+import inspect
+import threading
+import time
+
+# Upper bounds (milliseconds) of the latency histogram buckets, plus one
+# bucket for everything slower
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+@dataclass
+class Histogram:
+    """Durations of one instrumented operation."""
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(BUCKET_BOUNDS_MS) + 1))
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0  # seconds
+    max: float = 0.0  # seconds
+    last: float = 0.0  # seconds
+
+    def add(self, seconds: float, error: bool = False) -> None:
+        milliseconds = seconds * 1000
+        for index, bound in enumerate(BUCKET_BOUNDS_MS):
+            if milliseconds <= bound:
+                break
+        else:
+            index = len(BUCKET_BOUNDS_MS)
+        self.buckets[index] += 1
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound (seconds) of the bucket holding the q quantile."""
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return min(BUCKET_BOUNDS_MS[index] / 1000, self.max)
+                return self.max
+        return 0.0
+
+
+class PerfMonitor:
+    """Collects durations by kind ("compose", "mount", "tick", "update",
+    "http", "loop") and name (e.g. "ObsidianWidget.update_data").
+
+    Hot paths only record while `enabled`: when it is off, an instrumented
+    call costs one attribute check. Compose and mount durations happen once
+    per widget and are always recorded, so they are there when the
+    performance screen is first opened.
+    """
+
+    ALWAYS_RECORDED = ("compose", "mount")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.keep_enabled = False  # Collect even while the perf screen is closed
+        self.stats: dict[str, dict[str, Histogram]] = {}
+        # name -> counters with hits, misses and hit_rate (e.g. a PollStats),
+        # owned and updated by their component, always shown
+        self.hit_counters: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, seconds: float, error: bool = False) -> None:
+        # Recorded from worker threads too (http)
+        with self._lock:
+            histogram = self.stats.setdefault(kind, {}).get(name)
+            if histogram is None:
+                histogram = self.stats[kind][name] = Histogram()
+            histogram.add(seconds, error)
+
+    def watch_hits(self, name: str, counters: object) -> None:
+        """Show `counters` (hits, misses and hit_rate) on the performance screen."""
+        self.hit_counters[name] = counters
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats = {kind: stats for kind, stats in self.stats.items()
+                          if kind in self.ALWAYS_RECORDED}
+        for counters in self.hit_counters.values():
+            counters.hits = counters.misses = 0
+
+    def snapshot(self) -> dict[str, dict[str, Histogram]]:
+        """A copy of the stats, safe to read while recording goes on."""
+        with self._lock:
+            return {kind: {name: Histogram(list(h.buckets), h.count, h.errors, h.total, h.max, h.last)
+                           for name, h in stats.items()}
+                    for kind, stats in self.stats.items()}
+
+
+perf = PerfMonitor()
+
+
+def timed(kind: str, name: str | None = None) -> Callable:
+    """Decorator recording the duration of each call in `perf`, under the
+    function's qualified name. Generator functions (compose) are timed until
+    exhausted."""
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+        always = kind in PerfMonitor.ALWAYS_RECORDED
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not (always or perf.enabled):
+                    return (yield from func(*args, **kwargs))
+                start = time.perf_counter()
+                try:
+                    return (yield from func(*args, **kwargs))
+                finally:
+                    perf.record(kind, label, time.perf_counter() - start)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (always or perf.enabled):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                perf.record(kind, label, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable
+import heapq
+import itertools
+import time as _time
+from dashboard.utils.perf import perf
+
+# Cadences, in seconds, aligned on the local wall clock
+SECOND = 1
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def wall_seconds(time: datetime) -> int:
+    """Whole seconds since the epoch on the local wall clock, for a naive
+    local datetime such as `datetime.now()`."""
+    return int((time - _EPOCH).total_seconds())
+
+
+@dataclass(order=True)
+class _Job:
+    due: int
+    order: int
+    every: int = field(compare=False)
+    callback: Callable[[datetime], None] = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class TickScheduler:
+    """Runs callbacks at the cadence each one registered, from a single clock tick.
+
+    `tick` is meant to be called about once a second. A job registered with
+    `every=MINUTE` fires once per wall-clock minute, on the first tick at or
+    after the minute boundary: a tick delayed past a boundary (e.g. by a
+    blocked event loop) still fires it late instead of skipping it, and several
+    missed boundaries fire it only once. Jobs sit in a heap ordered by due
+    time, so a tick where nothing is due costs one comparison.
+
+    When the wall clock goes backwards (the DST fall-back hour, or an NTP
+    correction), jobs due further ahead than their cadence are moved back to
+    their first boundary at or after the new time, rather than waiting for
+    the clock to catch up.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: list[_Job] = []
+        self._order = itertools.count()
+        self._last: int | None = None
+
+    def register(self, callback: Callable[[datetime], None], every: int,
+                 now: datetime | None = None) -> Callable[[], None]:
+        """Call `callback(time)` every `every` seconds, starting at the next
+        boundary after `now`. Returns a function that unregisters it."""
+        start = wall_seconds(now or datetime.now())
+        job = _Job(self._next_boundary(start, every),
+                   next(self._order), every, callback)
+        heapq.heappush(self._jobs, job)
+
+        def unregister() -> None:
+            job.cancelled = True
+        return unregister
+
+    @staticmethod
+    def _next_boundary(seconds: int, every: int) -> int:
+        return (seconds // every + 1) * every
+
+    def _rewind(self, now: int) -> None:
+        for job in self._jobs:
+            if job.due - now > job.every:
+                job.due = self._next_boundary(now - 1, job.every)
+        heapq.heapify(self._jobs)
+
+    def tick(self, time: datetime) -> None:
+        """Run every job due at `time` (a naive local datetime)."""
+        now = wall_seconds(time)
+        if self._last is not None and now < self._last:
+            self._rewind(now)
+        self._last = now
+        while self._jobs and self._jobs[0].due <= now:
+            job = heapq.heappop(self._jobs)
+            if job.cancelled:
+                continue
+            job.due = self._next_boundary(now, job.every)
+            heapq.heappush(self._jobs, job)
+            if perf.enabled:
+                start = _time.perf_counter()
+                job.callback(time)
+                perf.record("tick", getattr(job.callback, "__qualname__", repr(job.callback)),
+                            _time.perf_counter() - start)
+            else:
+                job.callback(time)
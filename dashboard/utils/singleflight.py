@@ -0,0 +1,46 @@
+from dashboard.logger import get_logger
+from concurrent.futures import Future
+from typing import Callable, Hashable, TypeVar
+import threading
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time.
+
+    Callers asking for a key while its call is in flight wait for it and all
+    get its result (or its exception), instead of starting their own. Once it
+    completes, the next caller starts a new call: results are not kept, that
+    is left to the caches in front.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.shared = 0  # Calls saved by waiting for one in flight
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            logger.debug("Waiting for the call in flight for %s", key)
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,54 @@
+from dashboard.utils.cache import CacheEntry, ResponseCache, get_cache_dir
+import math
+import threading
+
+# Last known state of the widgets, rendered at startup before any live data
+# arrives. Saved when it changes, never expires.
+_snapshot: ResponseCache | None = None
+
+# States waiting for the writer thread, by name
+_unsaved: dict[str, object] = {}
+_unsaved_lock = threading.Lock()
+_writer: threading.Thread | None = None
+
+
+def _get_snapshot() -> ResponseCache:
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = ResponseCache(get_cache_dir() / "snapshot.json", math.inf)
+    return _snapshot
+
+
+def load_state(name: str) -> CacheEntry | None:
+    """Return the last state saved under `name`, with when it was saved, or None."""
+    return _get_snapshot().get((name,))
+
+
+def save_state(name: str, state) -> None:
+    """Persist a JSON-serialisable state, atomically, with every other widget's."""
+    _get_snapshot().set((name,), state)
+
+
+def save_state_later(name: str, state) -> None:
+    """Like save_state, but returns at once: the state is written by a
+    background thread, so the UI never waits on the snapshot file. A state
+    saved again before the thread got to it is only written once, the latest.
+    """
+    global _writer
+    with _unsaved_lock:
+        _unsaved[name] = state
+        if _writer is None:
+            # Not a daemon: the states saved right before exiting are written
+            _writer = threading.Thread(target=_write_unsaved, name="snapshot-writer")
+            _writer.start()
+
+
+def _write_unsaved() -> None:
+    global _writer
+    while True:
+        with _unsaved_lock:
+            if not _unsaved:
+                _writer = None
+                return
+            name, state = _unsaved.popitem()
+        save_state(name, state)
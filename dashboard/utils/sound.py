@@ -1,31 +1,265 @@
+from dashboard.logger import get_logger
+from dashboard.utils.cache import get_cache_dir
+from dataclasses import dataclass
+from pathlib import Path
 import os
 import platform
+import queue
+import shutil
 import subprocess
+import tempfile
+import threading
+import wave
 
+logger = get_logger(__name__)
 
-def play_sound(file_path: str) -> None:
+ASSETS_DIR = Path(__file__).parent.parent / "assets"
+WORK_END_SOUND = ASSETS_DIR / "sonnerie.mp3"
+BREAK_END_SOUND = ASSETS_DIR / "encore_du_travail.mp3"
+
+# Players of decoded WAV files, tried in order on Linux/Unix: they start in a
+# few milliseconds, unlike ffplay which also has to decode the MP3
+WAV_PLAYERS = (["paplay"], ["pw-play"], ["aplay", "-q"])
+# Players reading raw 16-bit PCM on stdin, tried in order on Linux/Unix. One
+# is kept running and every clip written to it, so a chime starts no process
+STREAM_PLAYERS = (
+    ["pacat", "--raw", "--format=s16le", "--rate={rate}", "--channels={channels}"],
+    ["pw-cat", "--playback", "--format", "s16", "--rate", "{rate}", "--channels", "{channels}", "-"],
+    ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", "{rate}", "-c", "{channels}"],
+)
+# Format of the decoded WAV files, the same for every clip so they can all be
+# written to the one stream player
+DECODE_RATE = 44100
+DECODE_CHANNELS = 2
+DECODE_TIMEOUT = 30  # seconds
+
+_decoded: dict[Path, Path] = {}
+_decode_lock = threading.Lock()
+_clips: dict[Path, "Clip | None"] = {}
+
+
+def decode_sound(file_path: str | Path) -> Path:
     """
-    Play a sound file using the default system player.
+    Decode a sound file to 16-bit WAV once, with ffmpeg, and return the WAV path.
 
-    Args:
-        file_path (str): The path to the sound file to play.
+    The WAV is kept in the cache directory, named after the source's size and
+    modification time, so a clip is only decoded again when it changes.
+    Falls back to the original file when ffmpeg is unavailable or fails.
 
     Raises:
         FileNotFoundError: If the file does not exist.
-        RuntimeError: If the sound could not be played.
     """
-    if not os.path.isfile(file_path):
+    file_path = Path(file_path)
+    if not file_path.is_file():
         raise FileNotFoundError(f"Sound file not found: {file_path}")
+    if file_path.suffix.lower() == ".wav":
+        return file_path
+    with _decode_lock:
+        if file_path in _decoded:
+            return _decoded[file_path]
+        stat = file_path.stat()
+        target = get_cache_dir() / "sounds" / \
+            f"{file_path.stem}-{stat.st_size}-{stat.st_mtime_ns}-{DECODE_RATE}.wav"
+        ffmpeg = shutil.which("ffmpeg")
+        if not target.is_file() and ffmpeg is not None:
+            tmp_path = None
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=target.parent, prefix=target.name, suffix=".tmp")
+                os.close(fd)
+                subprocess.run([ffmpeg, "-v", "error", "-y", "-i", str(file_path),
+                                "-ar", str(DECODE_RATE), "-ac", str(DECODE_CHANNELS),
+                                "-sample_fmt", "s16", "-f", "wav", tmp_path],
+                               check=True, timeout=DECODE_TIMEOUT, stdin=subprocess.DEVNULL)
+                os.replace(tmp_path, target)
+                logger.info("Decoded %s to %s", file_path.name, target)
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning("Failed to decode %s: %s", file_path, e)
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        _decoded[file_path] = target if target.is_file() else file_path
+        return _decoded[file_path]
+
+
+def _player_command(file_path: Path) -> list[str]:
+    if platform.system() == "Darwin":  # macOS
+        return ["afplay", str(file_path)]
+    if file_path.suffix.lower() == ".wav":
+        for player in WAV_PLAYERS:
+            if shutil.which(player[0]):
+                return [*player, str(file_path)]
+    return ["ffplay", "-v", "0", "-nodisp", "-autoexit", str(file_path)]
+
+
+def play_sound(file_path: str | Path) -> None:
+    """
+    Play a sound file using the default system player, blocking until done.
+    The file is decoded once (see `decode_sound`) and its WAV played.
+
+    Args:
+        file_path (str | Path): The path to the sound file to play.
 
-    system = platform.system()
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        RuntimeError: If the sound could not be played.
+    """
+    wav_path = decode_sound(file_path)
     try:
-        if system == "Darwin":  # macOS
-            subprocess.run(["afplay", file_path], check=True)
-        elif system == "Windows":
+        if platform.system() == "Windows":
             import winsound
-            winsound.PlaySound(file_path, winsound.SND_FILENAME)
-        else:  # Assume Linux/Unix
-            subprocess.run(["ffplay", "-v", "0", "-nodisp",
-                           "-autoexit", file_path], check=True)
+            winsound.PlaySound(str(wav_path), winsound.SND_FILENAME)
+        else:
+            subprocess.run(_player_command(wav_path), check=True,
+                           stdin=subprocess.DEVNULL)
     except Exception as e:
         raise RuntimeError(f"Failed to play sound: {e}")
+
+
+@dataclass
+class Clip:
+    """The PCM frames of a decoded sound, kept in memory."""
+    frames: bytes
+    rate: int
+    channels: int
+
+
+def load_clip(file_path: str | Path) -> Clip | None:
+    """
+    Decode a sound file (see `decode_sound`) and load its frames, once.
+    Returns None when it did not decode to a 16-bit WAV, which only
+    `play_sound` can play.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    file_path = Path(file_path)
+    if file_path in _clips:
+        return _clips[file_path]
+    wav_path = decode_sound(file_path)
+    clip = None
+    if wav_path.suffix.lower() == ".wav":
+        try:
+            with wave.open(str(wav_path), "rb") as wav:
+                if wav.getsampwidth() == 2:
+                    clip = Clip(wav.readframes(wav.getnframes()),
+                                wav.getframerate(), wav.getnchannels())
+        except (OSError, wave.Error, EOFError) as e:
+            logger.warning("Failed to load %s: %s", wav_path, e)
+    _clips[file_path] = clip
+    return clip
+
+
+class PcmStream:
+    """
+    A long-lived player process (see STREAM_PLAYERS) reading raw PCM on its
+    stdin. It is started on the first clip, and restarted only if it exits or
+    a clip comes in another format.
+    """
+
+    def __init__(self) -> None:
+        self._process: subprocess.Popen | None = None
+        self._format: tuple[int, int] | None = None
+        self._command: list[str] | None = None
+        self.available = platform.system() not in ("Darwin", "Windows")
+        if self.available:
+            self._command = next(
+                (player for player in STREAM_PLAYERS if shutil.which(player[0])), None)
+            self.available = self._command is not None
+
+    def _start(self, clip: Clip) -> subprocess.Popen:
+        self.close()
+        command = [part.format(rate=clip.rate, channels=clip.channels)
+                   for part in self._command]
+        logger.info("Starting the sound player: %s", " ".join(command))
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._format = (clip.rate, clip.channels)
+        return self._process
+
+    def play(self, clip: Clip) -> None:
+        """Write a clip to the player, blocking until most of it is played.
+
+        Raises:
+            OSError: If the player could not be started or fed.
+        """
+        process = self._process
+        if process is None or process.poll() is not None or \
+                self._format != (clip.rate, clip.channels):
+            process = self._start(clip)
+        try:
+            process.stdin.write(clip.frames)
+            process.stdin.flush()
+        except OSError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Let the player finish what it was given, and exit."""
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            self._process = None
+
+
+class SoundPlayer:
+    """
+    Plays sounds in order from a queue, in one long-lived thread.
+
+    `play` and `preload` never block: decoding and playing happen in the
+    thread, started on first use. Preloaded clips are kept in memory and
+    written to a long-lived player process (see PcmStream), so a sound
+    that is due starts at once. Without a stream player (macOS, Windows,
+    or none installed), each sound goes through `play_sound`.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.SimpleQueue[tuple[str, Path]] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._stream: PcmStream | None = None
+
+    def _submit(self, action: str, file_path: str | Path) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sound-player", daemon=True)
+                self._thread.start()
+        self._queue.put((action, Path(file_path)))
+
+    def preload(self, *file_paths: str | Path) -> None:
+        """Decode the given sounds in the background, ahead of their first play."""
+        for file_path in file_paths:
+            self._submit("decode", file_path)
+
+    def play(self, file_path: str | Path) -> None:
+        """Queue a sound, played after the ones already queued."""
+        self._submit("play", file_path)
+
+    def _play(self, file_path: Path) -> None:
+        clip = load_clip(file_path)
+        if clip is not None and self._stream.available:
+            try:
+                self._stream.play(clip)
+                return
+            except OSError as e:
+                logger.warning("Sound player failed, playing %s on its own: %s",
+                               file_path.name, e)
+        play_sound(file_path)
+
+    def _run(self) -> None:
+        self._stream = PcmStream()
+        while True:
+            action, file_path = self._queue.get()
+            try:
+                if action == "decode":
+                    load_clip(file_path)
+                else:
+                    self._play(file_path)
+            except (FileNotFoundError, RuntimeError) as e:
+                logger.error("Failed to %s %s: %s", action, file_path.name, e)
+
+
+sound_player = SoundPlayer()
@@ -1,3 +1,6 @@
+from collections import OrderedDict
+from rich.text import Text
+import hashlib
 
 
 def to_camel_case(text):
@@ -11,3 +14,29 @@ def to_camel_case(text):
     camel_case_text = ''.join(capitalized_words)
 
     return camel_case_text
+
+
+# Parsed ANSI payloads by hash, the most recently used last
+ANSI_CACHE_SIZE = 32
+_ansi_texts: OrderedDict[bytes, Text] = OrderedDict()
+
+
+def payload_hash(payload: str) -> bytes:
+    """Short digest identifying a payload, cheap to compare."""
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+def ansi_text(payload: str, digest: bytes | None = None) -> Text:
+    """Parse an ANSI payload into Rich Text, once per distinct payload.
+
+    The Text is shared by every caller with the same payload: don't modify it.
+    """
+    digest = digest or payload_hash(payload)
+    text = _ansi_texts.get(digest)
+    if text is None:
+        text = _ansi_texts[digest] = Text.from_ansi(payload)
+        if len(_ansi_texts) > ANSI_CACHE_SIZE:
+            _ansi_texts.popitem(last=False)
+    else:
+        _ansi_texts.move_to_end(digest)
+    return text
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+import re
+
+# (text, occurrence): identical items stay distinct, and an item keeps its
+# key when others are added or removed
+TodoKey = tuple[str, int]
+
+
+@dataclass
+class TodoItem:
+    key: TodoKey
+    text: str
+    done: bool
+    line: int  # Index of its line in the document
+
+
+@dataclass(frozen=True)
+class LineChange:
+    """One line of a document patch: the item, the index of its line, and
+    the line's text before and after."""
+    key: TodoKey
+    line: int
+    before: str
+    after: str
+
+
+class TodoDocument:
+    """
+    A Markdown todo list ("- [ ] item" / "- [x] item" lines) parsed once.
+
+    Items are indexed by key and know their line, so checking or unchecking
+    one is a single in-place edit of that line. The edits since parsing are
+    available as a patch of the changed lines only (`changes`), which can be
+    applied to a newer version of the text (`apply`). Lines other than items,
+    links ("- [Docs](...)") included, and everything from the first "####"
+    heading, are kept untouched.
+    """
+
+    CHECKBOX = 3  # Column of the checkbox mark in "- [ ] item"
+    ITEM = re.compile(r"- \[([ xX])\](?: |$)")
+
+    def __init__(self, text: str) -> None:
+        self.lines = text.split("\n")
+        self.items: list[TodoItem] = []
+        self._by_key: dict[TodoKey, TodoItem] = {}
+        self._by_line: dict[int, TodoItem] = {}
+        self._original: dict[int, str] = {}  # Lines edited, as parsed
+        occurrences: dict[str, int] = {}
+        for index, line in enumerate(self.lines):
+            match = self.ITEM.match(line)
+            if match:
+                # Remove "- [ ]" or "- [x]" and any extra brackets
+                item_text = line[6:].replace("]", "").replace("[", "").strip()
+                occurrences[item_text] = occurrences.get(item_text, -1) + 1
+                item = TodoItem((item_text, occurrences[item_text]), item_text,
+                                match[1] in "xX", index)
+                self.items.append(item)
+                self._by_key[item.key] = item
+                self._by_line[index] = item
+            # Stop if we reach a new section (e.g., a line starting with "####")
+            elif line.startswith("####"):
+                break
+
+    def __contains__(self, key: TodoKey) -> bool:
+        return key in self._by_key
+
+    def __getitem__(self, key: TodoKey) -> TodoItem:
+        return self._by_key[key]
+
+    def options(self) -> list[tuple[str, TodoKey, bool]]:
+        """The items as (text, key, done), to populate a SelectionList."""
+        return [(item.text, item.key, item.done) for item in self.items]
+
+    def set_done(self, key: TodoKey, done: bool) -> bool:
+        """Check or uncheck an item; returns whether its line changed.
+
+        Raises:
+            KeyError: If no item has this key.
+        """
+        item = self._by_key[key]
+        if item.done == done:
+            return False
+        line = self.lines[item.line]
+        self._original.setdefault(item.line, line)
+        self.lines[item.line] = line[:self.CHECKBOX] + \
+            ("x" if done else " ") + line[self.CHECKBOX + 1:]
+        item.done = done
+        return True
+
+    def changes(self) -> list[LineChange]:
+        """The lines edited since parsing, in document order."""
+        return [LineChange(self._by_line[index].key, index, before, self.lines[index])
+                for index, before in sorted(self._original.items())
+                if self.lines[index] != before]
+
+    def apply(self, changes: list[LineChange]) -> list[LineChange]:
+        """Apply a patch made on another version of this document.
+
+        Changes follow their item by key, wherever its line moved, whatever
+        its checkbox. Returns the changes that could not be applied: their
+        item was removed, or its line edited otherwise meanwhile.
+        """
+        rejected = []
+        for change in changes:
+            item = self._by_key.get(change.key)
+            if item is None or self._unchecked(self.lines[item.line]) != self._unchecked(change.before):
+                rejected.append(change)
+            else:
+                self.set_done(item.key, change.after[self.CHECKBOX] in "xX")
+        return rejected
+
+    @classmethod
+    def _unchecked(cls, line: str) -> str:
+        return line[:cls.CHECKBOX] + " " + line[cls.CHECKBOX + 1:]
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
@@ -0,0 +1,163 @@
+from dashboard.logger import get_logger
+from dashboard.utils.snapshot import load_state, save_state_later
+from dashboard.utils.todo import LineChange, TodoDocument, TodoKey
+from dataclasses import dataclass, field
+from typing import Callable
+import asyncio
+import random
+
+logger = get_logger(__name__)
+
+# Toggles closer than this (seconds) are uploaded together
+UPLOAD_DEBOUNCE = 1.5
+# Delays (seconds) between attempts after a failed upload, with +/-20% jitter
+UPLOAD_MIN_RETRY = 2
+UPLOAD_MAX_RETRY = 5 * 60
+
+_STATE_NAME = "todo_uploads"
+
+
+@dataclass
+class PendingList:
+    base: str  # Latest text of the list known from the backend
+    changes: dict[TodoKey, LineChange] = field(default_factory=dict)
+
+    def text(self) -> str:
+        """The base with the pending changes applied, as it should be uploaded."""
+        document = TodoDocument(self.base)
+        document.apply(list(self.changes.values()))
+        return document.text()
+
+    def settle(self, base: str) -> None:
+        """Make `base` the latest text from the backend: the changes it has
+        already are dropped, the others now start from its lines."""
+        document = TodoDocument(base)
+        changes = {}
+        for key, change in self.changes.items():
+            if key in document:
+                line = document[key].line
+                if document.lines[line] != change.after:
+                    changes[key] = LineChange(key, line, document.lines[line], change.after)
+        self.base = base
+        self.changes = changes
+
+
+class TodoUploadQueue:
+    """
+    Write-behind queue of todo list edits.
+
+    Edits are recorded as line changes (see `TodoDocument.changes`) against the
+    list's latest text from the backend, and persisted, so they survive a
+    restart. `run` uploads them once no new edit came for UPLOAD_DEBOUNCE
+    seconds: any number of toggles in a list cost one request. Failed uploads
+    are retried with jittered exponential backoff.
+
+    Meanwhile, lists fetched from the backend go through `rebase`, which
+    re-applies the edits not uploaded yet: the UI keeps showing them.
+
+    `upload(target, text)` is called in a thread and raises on failure.
+    Targets are opaque names of the lists, e.g. "todo".
+    """
+
+    def __init__(self, upload: Callable[[str, str], None], debounce: float = UPLOAD_DEBOUNCE) -> None:
+        self.upload = upload
+        self.debounce = debounce
+        self.pending: dict[str, PendingList] = {}
+        self._uploading: set[str] = set()  # Targets whose upload is in flight
+        self._changed = asyncio.Event()
+        snapshot = load_state(_STATE_NAME)
+        for target, state in (snapshot.value if snapshot else {}).items():
+            changes = (LineChange((key[0], key[1]), line, before, after)
+                       for key, line, before, after in state["changes"])
+            self.pending[target] = PendingList(
+                state["base"], {change.key: change for change in changes})
+        if self.pending:
+            logger.info("Resuming todo uploads: %s", ", ".join(self.pending))
+            self._changed.set()
+
+    def _save(self) -> None:
+        # Written from a thread, the snapshot file is shared with every widget
+        save_state_later(_STATE_NAME, {
+            target: {"base": pending.base,
+                     "changes": [(change.key, change.line, change.before, change.after)
+                                 for change in pending.changes.values()]}
+            for target, pending in self.pending.items()})
+
+    def record(self, target: str, base: str, change: LineChange) -> None:
+        """Queue an edit of `target`, whose latest text from the backend is `base`.
+        Toggling an item back before it is uploaded cancels its edit; while
+        the list is being uploaded, it is kept, to be undone once uploaded."""
+        pending = self.pending.setdefault(target, PendingList(base))
+        previous = pending.changes.get(change.key)
+        if previous is not None:
+            change = LineChange(change.key, change.line, previous.before, change.after)
+        if change.before == change.after and target not in self._uploading:
+            del pending.changes[change.key]
+        else:
+            pending.changes[change.key] = change
+        if not pending.changes:
+            del self.pending[target]
+        self._save()
+        self._changed.set()
+
+    def rebase(self, target: str, text: str) -> TodoDocument:
+        """Parse a list fetched from the backend, with the edits still pending
+        applied. Edits of items removed or changed meanwhile are dropped."""
+        document = TodoDocument(text)
+        pending = self.pending.get(target)
+        if pending is None:
+            return document
+        pending.base = text
+        for change in document.apply(list(pending.changes.values())):
+            logger.warning("Dropping todo edit of %r, changed on the backend", change.key[0])
+            del pending.changes[change.key]
+        if not pending.changes and target not in self._uploading:
+            del self.pending[target]
+        self._save()
+        return document
+
+    async def run(self) -> None:
+        """Upload the edits as they come, until cancelled."""
+        retry = UPLOAD_MIN_RETRY
+        while True:
+            await self._changed.wait()
+            # Wait for the edits to settle
+            while True:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), self.debounce)
+                except TimeoutError:
+                    break
+            if await self.flush():
+                retry = UPLOAD_MIN_RETRY
+            else:
+                delay = retry * random.uniform(0.8, 1.2)
+                logger.warning("Retrying todo uploads in %.0fs", delay)
+                await asyncio.sleep(delay)
+                retry = min(retry * 2, UPLOAD_MAX_RETRY)
+                self._changed.set()
+
+    async def flush(self) -> bool:
+        """Upload every list with pending edits; returns whether all succeeded."""
+        succeeded = True
+        for target, pending in list(self.pending.items()):
+            sent = len(pending.changes)
+            text = pending.text()
+            self._uploading.add(target)
+            try:
+                await asyncio.to_thread(self.upload, target, text)
+            except Exception as e:
+                logger.error("Failed to upload %s: %s", target, e)
+                succeeded = False
+                text = pending.base
+            else:
+                logger.info("Uploaded %s edit(s) of %s", sent, target)
+            finally:
+                self._uploading.discard(target)
+            # Edits made during the upload stay queued, against the text
+            # uploaded: an item toggled back is now an edit of its own
+            pending.settle(text)
+            if not pending.changes:
+                del self.pending[target]
+        self._save()
+        return succeeded
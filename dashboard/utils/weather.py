@@ -1,83 +1,241 @@
-from dashboard.logger import logger
-import requests
+from dashboard.logger import get_logger
+from dashboard.utils.cache import CacheEntry, ResponseCache, get_cache_dir
+from dashboard.utils.geolocation import DEFAULT_CITY, get_city_async
+from dashboard.utils.http_client import http_get
+from dashboard.utils.singleflight import SingleFlight
+from dashboard.utils.weather_render import render_minimal_weather, render_weather
+import asyncio
+import os
+import threading
 
-DEFAULT_CITY = "Roubaix"
+logger = get_logger(__name__)
 
+WTTR_LANG = "fr"
 
-def get_weather_report(city: str, version: int = 1) -> str:
-    """
-    Fetch the weather report for a given city and wttr.in API version (1, 2, or 3).
+# Overridable with the WTTR_URL and WTTR_REPORT_URL environment variables,
+# e.g. to run against dashboard.stubs.wttr_server
+DEFAULT_WTTR_URL = "https://wttr.in"
+DEFAULT_WTTR_REPORT_URL = "https://v{version}.wttr.in"
+
+# wttr.in responses are cached on disk and reused across restarts for this
+# long (seconds), overridable with the WEATHER_CACHE_TTL environment variable
+DEFAULT_WEATHER_CACHE_TTL = 30 * 60
+
+# wttr.in query formats, part of the cache key: the current conditions and
+# forecast as JSON, rendered locally for both the full and minimal views, and
+# the full ANSI reports of the weather screen
+DATA_FORMAT = "format=j1"
+REPORT_FORMAT = "F"
+
+_weather_cache: ResponseCache | None = None
+_weather_cache_lock = threading.Lock()
+# Every view asking for the same data at the same moment (e.g. on the hour)
+# shares one request
+weather_fetches = SingleFlight()
+
+
+def get_weather_cache() -> ResponseCache:
+    """Return the shared wttr.in response cache, created on first use."""
+    global _weather_cache
+    with _weather_cache_lock:
+        if _weather_cache is None:
+            ttl = float(os.getenv("WEATHER_CACHE_TTL",
+                        DEFAULT_WEATHER_CACHE_TTL))
+            _weather_cache = ResponseCache(
+                get_cache_dir() / "weather.json", ttl)
+    return _weather_cache
+
+
+def weather_cache_key(city: str, format: str, version: int = 1, lang: str = WTTR_LANG) -> tuple:
+    return (city, format, version, lang)
+
+
+def _cached_fetch(key: tuple, fetch) -> str | dict | None:
+    """Return the cached value for `key` while fresh, otherwise call `fetch`,
+    once for all the concurrent callers with the same key. Values are a
+    report's text for REPORT_FORMAT keys, the compact j1 data (see
+    `compact_weather_data`) for DATA_FORMAT keys.
+
+    A failed fetch falls back to the stale value when there is one.
     """
-    if version not in (1, 2, 3):
-        logger.error(f"Invalid version: {version}. Must be 1, 2, or 3.")
-        return "Invalid weather API version"
+    entry = get_weather_cache().get(key)
+    if entry is not None and entry.is_fresh:
+        return entry.value
+    return weather_fetches.do(key, lambda: _revalidate(key, fetch))
+
+
+def _revalidate(key: tuple, fetch) -> str | dict | None:
+    cache = get_weather_cache()
+    entry = cache.get(key)
+    # Refreshed by a call that completed since the caller checked
+    if entry is not None and entry.is_fresh:
+        return entry.value
+    value = fetch()
+    if value is not None:
+        cache.set(key, value)
+        return value
+    if entry is not None:
+        logger.warning(
+            "Serving stale weather data for %s (%.0fs old)", key, entry.age)
+        return entry.value
+    return None
+
+
+def wttr_url() -> str:
+    return os.getenv("WTTR_URL", DEFAULT_WTTR_URL)
+
+
+def wttr_report_url(version: int) -> str:
+    return os.getenv("WTTR_REPORT_URL", DEFAULT_WTTR_REPORT_URL).format(version=version)
+
+
+def _fetch_weather_report(city: str, version: int) -> str | None:
     try:
-        response = requests.get(
-            f'https://v{version}.wttr.in/{city}?F&lang=fr')
+        response = http_get(
+            f'{wttr_report_url(version)}/{city}?{REPORT_FORMAT}&lang={WTTR_LANG}')
         if response.status_code == 200:
             return response.text
         else:
             logger.error(
-                f"Failed to fetch weather data for {city}: {response.status_code}")
+                "Failed to fetch weather data for %s: %s", city, response.status_code)
     except Exception as e:
-        logger.error(f"Error fetching weather data: {e}")
+        logger.error("Error fetching weather data: %s", e)
 
 
-def get_minimal_weather(city: str = DEFAULT_CITY) -> str | None:
-    """Fetch minimal weather data from wttr.in for small screens.
-
-    Returns a simple format with just temperature and condition.
+def get_weather_report(city: str, version: int = 1) -> str | None:
     """
+    Fetch the weather report for a given city and wttr.in API version (1, 2, or 3).
+    Returns None when it could not be fetched and none is cached.
+    """
+    if version not in (1, 2, 3):
+        logger.error("Invalid version: %s. Must be 1, 2, or 3.", version)
+        return "Invalid weather API version"
+    return _cached_fetch(weather_cache_key(city, REPORT_FORMAT, version),
+                         lambda: _fetch_weather_report(city, version))
+
+
+def compact_weather_data(j1: dict) -> dict:
+    """Keep the parts of a wttr.in j1 payload that are rendered, a fraction of
+    its size: the current conditions and a forecast line per day."""
+    current = j1["current_condition"][0]
+    lang_key = f"lang_{WTTR_LANG}"
+    return {
+        "current": {
+            "temp_C": int(current["temp_C"]),
+            "FeelsLikeC": int(current["FeelsLikeC"]),
+            "weatherCode": current["weatherCode"],
+            "desc": (current.get(lang_key) or current["weatherDesc"])[0]["value"].strip(),
+            "windspeedKmph": int(current["windspeedKmph"]),
+            "winddirDegree": int(current["winddirDegree"]),
+            "visibility": int(current["visibility"]),
+            "precipMM": float(current["precipMM"]),
+        },
+        "forecast": [{
+            "date": day["date"],
+            "maxtempC": int(day["maxtempC"]),
+            "mintempC": int(day["mintempC"]),
+            # Midday conditions stand for the whole day
+            "weatherCode": day["hourly"][len(day["hourly"]) // 2]["weatherCode"],
+        } for day in j1.get("weather", [])],
+    }
+
+
+def _fetch_weather_data(city: str) -> dict | None:
+    import requests  # Deferred to the first fetch, off the startup path
+
     try:
-        logger.info(f'Fetching minimal weather data for {city}')
-        # Use format=3 for minimal output: "Location: condition, temperature"
-        response = requests.get(
-            f'https://wttr.in/{city}?format=3&lang=fr')
+        url = f'{wttr_url()}/{city}?{DATA_FORMAT}&lang={WTTR_LANG}'
+        logger.info('Fetching weather data with url : %s', url)
+        response = http_get(url)
         if response.status_code == 200:
-            weather_text = response.text.strip()
-            logger.info(f"Minimal weather data fetched: {weather_text}")
-            return weather_text
-        else:
-            logger.error(
-                f'Error fetching minimal weather data status code: {response.status_code}')
-            return None
+            return compact_weather_data(response.json())
+        logger.error(
+            'Error fetching weather data status code: %s', response.status_code)
     except requests.RequestException as e:
-        logger.error(f"Error fetching minimal weather data: {e}")
-        return None
+        logger.error("Error fetching weather data: %s", e)
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        logger.error("Unexpected weather data for %s: %s", city, e)
+    return None
+
+
+def get_weather_data(city: str = DEFAULT_CITY) -> dict | None:
+    """Fetch the current conditions and forecast for `city`, one request
+    shared by every view (see `compact_weather_data` for the format)."""
+    return _cached_fetch(weather_cache_key(city, DATA_FORMAT),
+                         lambda: _fetch_weather_data(city))
+
+
+def get_minimal_weather(city: str = DEFAULT_CITY) -> str | None:
+    """Weather for small screens: just condition and temperature, e.g.
+    "Roubaix: ☀️ +18°C"."""
+    data = get_weather_data(city)
+    return render_minimal_weather(city, data) if data else None
 
 
 def get_weather(city: str = DEFAULT_CITY) -> str | None:
-    """Fetch the weather data from wttr.in for Roubaix.
+    """Current conditions for `city`, as ANSI text with the condition's icon."""
+    data = get_weather_data(city)
+    return render_weather(data) if data else None
 
-    """
-    try:
-        logger.info(
-            f'Fetching weather data with url : https://wttr.in/{city}?0Q&lang=fr&format=j1')
-        response = requests.get(
-            f'https://wttr.in/{city}?0Q&lang=fr')
-        if response.status_code == 200:
-            weather_text = response.text.strip()
-            logger.info(response)
-            return weather_text
-        else:
-            logger.error(
-                f'Error fetching weather data status code: {response.status_code}')
-    except requests.RequestException as e:
-        logger.error(e)
 
+# Cache lookups without any network access, fresh or stale: callers render
+# these instantly, then revalidate with the fetch functions when not fresh.
 
-def get_city(default_city: str = DEFAULT_CITY) -> str:
-    """Return the city name for the current position.
-    Returns:
-        str: The city name or default_city if it cannot be determined.
-    """
-    try:
-        response = requests.get('https://ipapi.co/json/')
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('city')
-        else:
-            return default_city
-    except Exception as e:
-        logger.error(f"Error fetching city name: {e}")
-        return default_city
+def peek_weather_report(city: str, version: int = 1) -> CacheEntry | None:
+    return get_weather_cache().get(weather_cache_key(city, REPORT_FORMAT, version))
+
+
+def peek_weather_data(city: str = DEFAULT_CITY) -> CacheEntry | None:
+    return get_weather_cache().get(weather_cache_key(city, DATA_FORMAT))
+
+
+def _peek_rendered(city: str, render) -> CacheEntry | None:
+    entry = peek_weather_data(city)
+    if entry is None or entry.value is None:
+        return None
+    return CacheEntry(render(entry.value), entry.fetched_at, entry.ttl)
+
+
+def peek_minimal_weather(city: str = DEFAULT_CITY) -> CacheEntry | None:
+    return _peek_rendered(city, lambda data: render_minimal_weather(city, data))
+
+
+def peek_weather(city: str = DEFAULT_CITY) -> CacheEntry | None:
+    return _peek_rendered(city, render_weather)
+
+
+# Async variants: the blocking calls above run in a thread so they can be
+# awaited from Textual workers without stalling the event loop. Cancelling the
+# awaiting worker returns immediately; the thread itself is bounded by
+# the shared client's REQUEST_TIMEOUT.
+
+async def get_weather_report_async(city: str, version: int = 1) -> str | None:
+    """Non-blocking version of `get_weather_report`."""
+    return await asyncio.to_thread(get_weather_report, city, version)
+
+
+async def get_minimal_weather_async(city: str = DEFAULT_CITY) -> str | None:
+    """Non-blocking version of `get_minimal_weather`."""
+    return await asyncio.to_thread(get_minimal_weather, city)
+
+
+async def get_weather_async(city: str = DEFAULT_CITY) -> str | None:
+    """Non-blocking version of `get_weather`."""
+    return await asyncio.to_thread(get_weather, city)
+
+
+WEATHER_REPORT_VERSIONS = (1, 2, 3)
+
+
+async def get_weather_reports_async(city: str) -> dict[int, str | None]:
+    """Fetch every wttr.in report version for `city` concurrently."""
+    reports = await asyncio.gather(*(get_weather_report_async(city, version)
+                                     for version in WEATHER_REPORT_VERSIONS))
+    return dict(zip(WEATHER_REPORT_VERSIONS, reports))
+
+
+async def prefetch_weather_reports() -> None:
+    """Warm the cache with every report version `WeatherScreen` cycles
+    through, so it renders instantly. A no-op while they are fresh."""
+    city = await get_city_async()
+    await get_weather_reports_async(city)
@@ -0,0 +1,136 @@
+"""
+Local rendering of wttr.in's structured weather data (see
+`dashboard.utils.weather.compact_weather_data`), in the style of wttr.in's own
+text output: the current conditions with an ANSI icon (?0Q), and a one line
+summary (?format=3).
+"""
+
+RESET = "\x1b[0m"
+
+# wttr.in's weather codes (from worldweatheronline) by condition
+WWO_CODES = {
+    "113": "Sunny", "116": "PartlyCloudy", "119": "Cloudy", "122": "VeryCloudy",
+    "143": "Fog", "176": "LightShowers", "179": "LightSleetShowers", "182": "LightSleet",
+    "185": "LightSleet", "200": "ThunderyShowers", "227": "LightSnow", "230": "HeavySnow",
+    "248": "Fog", "260": "Fog", "263": "LightShowers", "266": "LightRain",
+    "281": "LightSleet", "284": "LightSleet", "293": "LightRain", "296": "LightRain",
+    "299": "HeavyShowers", "302": "HeavyRain", "305": "HeavyShowers", "308": "HeavyRain",
+    "311": "LightSleet", "314": "LightSleet", "317": "LightSleet", "320": "LightSnow",
+    "323": "LightSnowShowers", "326": "LightSnowShowers", "329": "HeavySnow",
+    "332": "HeavySnow", "335": "HeavySnowShowers", "338": "HeavySnow",
+    "350": "LightSleet", "353": "LightShowers", "356": "HeavyShowers", "359": "HeavyRain",
+    "362": "LightSleetShowers", "365": "LightSleetShowers", "368": "LightSnowShowers",
+    "371": "HeavySnowShowers", "374": "LightSleetShowers", "377": "LightSleet",
+    "386": "ThunderyShowers", "389": "ThunderyHeavyRain", "392": "ThunderySnowShowers",
+    "395": "HeavySnowShowers",
+}
+
+WEATHER_SYMBOLS = {
+    "Unknown": "✨", "Sunny": "☀️", "PartlyCloudy": "⛅️", "Cloudy": "☁️",
+    "VeryCloudy": "☁️", "Fog": "🌫", "LightShowers": "🌦", "LightRain": "🌦",
+    "HeavyShowers": "🌧", "HeavyRain": "🌧", "LightSleet": "🌧", "LightSleetShowers": "🌧",
+    "LightSnow": "🌨", "LightSnowShowers": "🌨", "HeavySnow": "❄️", "HeavySnowShowers": "❄️",
+    "ThunderyShowers": "⛈", "ThunderyHeavyRain": "🌩", "ThunderySnowShowers": "⛈",
+}
+
+# 5 lines of 13 columns, with their 256 color
+SUN = (226, ["    \\   /    ",
+             "     .-.     ",
+             "  ― (   ) ―  ",
+             "     `-’     ",
+             "    /   \\    "])
+PARTLY_CLOUDY = (226, ["   \\  /      ",
+                       ' _ /"".-.    ',
+                       "   \\_(   ).  ",
+                       "   /(___(__) ",
+                       "             "])
+CLOUD = (250, ["             ",
+               "     .--.    ",
+               "  .-(    ).  ",
+               " (___.__)__) ",
+               "             "])
+FOG = (251, ["             ",
+             " _ - _ - _ - ",
+             "  _ - _ - _  ",
+             " _ - _ - _ - ",
+             "             "])
+RAIN_CLOUD = ["     .-.     ",
+              "    (   ).   ",
+              "   (___(__)  "]
+LIGHT_RAIN = (111, RAIN_CLOUD + ["    ‘ ‘ ‘ ‘  ",
+                                 "   ‘ ‘ ‘ ‘   "])
+HEAVY_RAIN = (21, RAIN_CLOUD + ["  ‚‘‚‘‚‘‚‘   ",
+                                "  ‚’‚’‚’‚’   "])
+SLEET = (111, RAIN_CLOUD + ["    ‘ * ‘ *  ",
+                            "   * ‘ * ‘   "])
+SNOW = (255, RAIN_CLOUD + ["    *  *  *  ",
+                           "   *  *  *   "])
+THUNDER = (228, RAIN_CLOUD + ["   ⚡‘‘⚡‘‘  ",
+                              "    ‘ ‘ ‘ ‘  "])
+UNKNOWN = (0, ["    .-.      ",
+               "     __)     ",
+               "    (        ",
+               "     `-’     ",
+               "      •      "])
+
+ICONS = {
+    "Sunny": SUN, "PartlyCloudy": PARTLY_CLOUDY, "Cloudy": CLOUD, "VeryCloudy": CLOUD,
+    "Fog": FOG, "LightShowers": LIGHT_RAIN, "LightRain": LIGHT_RAIN,
+    "HeavyShowers": HEAVY_RAIN, "HeavyRain": HEAVY_RAIN, "LightSleet": SLEET,
+    "LightSleetShowers": SLEET, "LightSnow": SNOW, "LightSnowShowers": SNOW,
+    "HeavySnow": SNOW, "HeavySnowShowers": SNOW, "ThunderyShowers": THUNDER,
+    "ThunderyHeavyRain": THUNDER, "ThunderySnowShowers": THUNDER,
+}
+
+# Where the wind blows to, by 45° sector of where it comes from (N first)
+WIND_ARROWS = "↓↙←↖↑↗→↘"
+
+# Temperature colors, from the coldest: (upper bound °C, 256 color)
+TEMPERATURE_COLORS = ((-15, 21), (-5, 33), (0, 45), (5, 50), (10, 82),
+                      (15, 154), (20, 190), (25, 226), (30, 214), (35, 202))
+HOT_COLOR = 196
+
+
+def color(code: int, text: str) -> str:
+    return f"\x1b[38;5;{code}m{text}{RESET}"
+
+
+def condition(weather_code: str) -> str:
+    return WWO_CODES.get(weather_code, "Unknown")
+
+
+def temperature(celsius: int) -> str:
+    for bound, code in TEMPERATURE_COLORS:
+        if celsius <= bound:
+            break
+    else:
+        code = HOT_COLOR
+    return color(code, f"{celsius:+d}")
+
+
+def render_weather(data: dict) -> str:
+    """The current conditions: icon on the left, then description,
+    temperature (feels like), wind, visibility and precipitation."""
+    current = data["current"]
+    icon_color, icon = ICONS.get(condition(current["weatherCode"]), UNKNOWN)
+    feels_like = current["FeelsLikeC"]
+    temperatures = temperature(current["temp_C"])
+    if feels_like != current["temp_C"]:
+        temperatures += f"({temperature(feels_like)})"
+    arrow = WIND_ARROWS[round(current["winddirDegree"] / 45) % 8]
+    details = [
+        current["desc"],
+        f"{temperatures} °C",
+        f"{arrow} {current['windspeedKmph']} km/h",
+        f"{current['visibility']} km",
+        f"{current['precipMM']:.1f} mm",
+    ]
+    return "\n".join(f"{color(icon_color, line) if icon_color else line} {detail}"
+                     for line, detail in zip(icon, details))
+
+
+def render_minimal_weather(city: str, data: dict) -> str:
+    """One line summary, e.g. "Roubaix: ☀️   +18°C"."""
+    current = data["current"]
+    symbol = WEATHER_SYMBOLS[condition(current["weatherCode"])]
+    return f"{city}: {symbol}   {current['temp_C']:+d}°C"
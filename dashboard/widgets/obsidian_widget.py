@@ -1,12 +1,23 @@
-from dashboard.logger import logger
-from dashboard.utils import API_URL, API_KEY
+from dashboard.logger import get_logger
+from dashboard.utils import (MissingCredentialsError, ObsidianClient, ObsidianSubscription,
+                             LineChange, TodoDocument, TodoUploadQueue, load_state, save_state,
+                             timed)
 from textual.widget import Widget
-from textual.widgets import SelectionList, Static
+from textual.widgets import OptionList, SelectionList, Static
 from textual.app import ComposeResult
-from datetime import datetime
-from textual.reactive import reactive
+from datetime import date, datetime, timedelta
 from textual import on
-import requests
+from textual.message import Message
+import asyncio
+import time
+
+logger = get_logger(__name__)
+
+# Data key of the todo list shown by each SelectionList
+TODO_LISTS = {"daily_todo_list": "daily_todo", "todo_list": "todo"}
+# Shown by each SelectionList in place of its placeholder when a fetch fails
+TODO_LIST_ERRORS = {"daily_todo_list": "Error fetching daily todo list.",
+                    "todo_list": "Error fetching todo list."}
 
 DEFAULT_CALENDAR = """
 | 08:00| Morning Meeting |
@@ -19,29 +30,69 @@ DEFAULT_CALENDAR = """
 """
 
 
-def todo_list_formatting(daily_todo: str) -> list[(str, int, bool)]:
+def insert_selections(selection_list: SelectionList, index: int, items: list) -> None:
     """
-    Gets the Todo list section from the provided data string and returns a list of tuples formatted as (text, index, done).
-    You can use this to populate a SelectionList widget in Textual.
+    Insert `items` before the option at `index` of a SelectionList. It can only append
+    (add_options), so they are appended, then moved in place with the index mappings
+    add_options maintains.
     """
-
-    selection_list = []
-    count = 0
-
-    for line in daily_todo.splitlines():
-        if not line:
-            continue
-        if line.startswith("- ["):
-            done = line.startswith("- [x]")
-            # Remove "- [ ]" or "- [x]" and any extra brackets
-            text = line[6:].replace("]", "").replace("[", "").strip()
-            selection_list.append((text, count, done))
-            count += 1
-        # Stop if we reach a new section (e.g., a line starting with "####")
-        elif line.startswith("####"):
-            break
-    logger.debug(f"Converted data to todo list: {selection_list}")
-    return selection_list
+    count = selection_list.option_count
+    selection_list.add_options(items)
+    if index == count or not items:
+        return
+    options = selection_list._options
+    options[index:index] = options[count:]
+    del options[count + len(items):]
+    for position in range(index, len(options)):
+        option = options[position]
+        selection_list._option_to_index[option] = position
+        selection_list._values[option.value] = position
+    selection_list._clear_caches()
+
+
+def patch_selection_list(selection_list: SelectionList, items: list[(str, (str, int), bool)]) -> None:
+    """
+    Update a SelectionList in place to show `items` (as returned by TodoDocument.options).
+    Options are matched by key: removed items are dropped, and the options already in
+    place at the start and at the end are kept, only the ones in between are removed
+    and inserted. Only the kept options whose done state changed are toggled, so the
+    highlight and scroll position are kept.
+    """
+    new_keys = [key for _, key, _ in items]
+    wanted = set(new_keys)
+    highlighted = selection_list.highlighted
+    highlighted_key = None if highlighted is None else selection_list.get_option_at_index(
+        highlighted).value
+    # Intermediate highlight moves would point at options removed by the time they are handled
+    with selection_list.prevent(SelectionList.SelectedChanged, OptionList.OptionHighlighted):
+        # Drop removed items, from the end so the indexes stay valid
+        for index in reversed(range(selection_list.option_count)):
+            if selection_list.get_option_at_index(index).value not in wanted:
+                selection_list.remove_option_at_index(index)
+        # Keep the options already in the right order at both ends, replace the middle
+        kept = [option.value for option in selection_list.options]
+        common = 0
+        while common < len(kept) and kept[common] == new_keys[common]:
+            common += 1
+        suffix = 0
+        while (suffix < min(len(kept), len(new_keys)) - common
+               and kept[-1 - suffix] == new_keys[-1 - suffix]):
+            suffix += 1
+        for index in reversed(range(common, len(kept) - suffix)):
+            selection_list.remove_option_at_index(index)
+        insert_selections(selection_list, common, items[common:len(items) - suffix])
+        # Toggle the kept items whose state changed
+        selected = set(selection_list.selected)
+        for _, key, done in items[:common] + items[len(items) - suffix:]:
+            if done and key not in selected:
+                selection_list.select(key)
+            elif not done and key in selected:
+                selection_list.deselect(key)
+    # Keep the highlight on the same item when it is still there
+    if highlighted_key in wanted:
+        selection_list.highlighted = new_keys.index(highlighted_key)
+    elif highlighted is not None and selection_list.option_count:
+        selection_list.highlighted = min(highlighted, selection_list.option_count - 1)
 
 
 class DailyStats(Widget):
@@ -56,6 +107,8 @@ class DailyStats(Widget):
 
     def get_text(self, routine_dict: dict) -> None:
         logger.debug(routine_dict)
+        if "loading" in routine_dict:
+            return "Loading..."
         if "error" in routine_dict:
             return "Error fetching data."
 
@@ -106,161 +159,234 @@ class DailyCalendar(Widget):
         self.query_one(Static).update(new_data)
 
 
+class NotesChanged(Message):
+    """Message posted from the events stream thread when the backend announces a change."""
+
+    def __init__(self, kind: str):
+        super().__init__()
+        self.kind = kind
+
+
 class ObsidianWidget(Widget):
     """A widget to display my obsidian related todo, planning and stats """
 
-    time: reactive[datetime] = reactive(datetime.now)
+    TICK_EVERY = 15  # Fallback polling cadence, in seconds
+
+    # The todo lists don't bind these, they bubble up from them
+    BINDINGS = [
+        ("left", "previous_day", "Previous day"),
+        ("right", "next_day", "Next day"),
+        ("t", "today", "Today"),
+    ]
 
     def __init__(self, small_screen: bool = False) -> None:
         self.BORDER_TITLE = "Obsidian Dashboard"
         self.small_screen = small_screen
-        self.data = self._get_data()
-        self.uploading = False  # When data is being uploaded, no new data can be fetched
+        self.day: date | None = None  # Day shown, None for today (follows midnight)
+        self.data = None  # Fetched in a worker once mounted
+        self.fetched_at = None  # Wall clock of the data shown
+        self.documents: dict[str, TodoDocument] = {}  # Parsed todo lists, by data key
+        self.refreshing = False
+        self.refresh_pending = False
+        try:
+            self.client = ObsidianClient()
+        except MissingCredentialsError as e:
+            # Only this widget needs the credentials, the rest of the dashboard runs without
+            logger.error("Obsidian widget disabled: %s", e)
+            self.client = self.subscription = self.uploads = None
+            self.data = {"error": str(e)}
+        else:
+            # Changes are pushed by the backend, polling is only a fallback
+            # while the events stream is down (post_message is thread safe)
+            self.subscription = ObsidianSubscription(
+                self.client, on_change=lambda kind: self.post_message(NotesChanged(kind)))
+            # Todo edits are uploaded in the background, pending ones resumed
+            self.uploads = TodoUploadQueue(self.client.upload_todo)
+            # Show the last data fetched until the first fetch reconciles it
+            snapshot = load_state("obsidian")
+            if snapshot is not None:
+                self.data = snapshot.value
+                self.fetched_at = snapshot.fetched_at
+                self.BORDER_SUBTITLE = datetime.fromtimestamp(
+                    snapshot.fetched_at).strftime("Saved %d/%m %H:%M")
         super().__init__()
 
-    def _get_data(self) -> dict:
-        """Get the data to be displayed in the widget by calling a FastAPI endpoint."""
+    def refresh_data(self) -> None:
+        """Fetch fresh data in a worker, off the event loop, then display it.
+        A refresh requested while one is running is done right after it, never
+        cancelling it: its payload is already recorded as seen by the client."""
+        if self.client is None:
+            return
+        if self.refreshing:
+            self.refresh_pending = True
+            return
+        self.refreshing = True
+        self.run_worker(self._refresh_data, group="obsidian")
+
+    async def _refresh_data(self) -> None:
         try:
-            response = requests.get(f"{API_URL}/daily/{datetime.now().strftime('%Y-%m-%d')}",
-                                    # the certificate is self certified
-                                    headers={"X-API-KEY": API_KEY}, verify=False)
-            response.raise_for_status()
-            logger.debug(
-                f"Fetched data from FastAPI endpoint: {response.text}")
-
-            todo_response = requests.get(f"{API_URL}/to_do_list",
-                                         # the certificate is self certified
-                                         headers={"X-API-KEY": API_KEY}, verify=False)
-            todo_response.raise_for_status()
-            # add merged data to response
-            response_data = response.json()
-            todo_data = todo_response.json()
-            response_data["todo"] = todo_data.get("todo_list", "")
-            return response_data
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch data from FastAPI endpoint: {e}")
-            return {"error": str(e)}
+            self.refresh_pending = True
+            while self.refresh_pending:
+                self.refresh_pending = False
+                day = self.day
+                new_data = await asyncio.to_thread(self.client.fetch, day and day.isoformat())
+                if day != self.day:
+                    continue  # Moved to another day meanwhile, refreshed next
+                if new_data is not None:  # None: unchanged, nothing to re-render
+                    self.update_data(new_data)
+                if new_data is not None and "error" in new_data:
+                    self.show_stale()
+                    continue
+                self.fetched_at = time.time()
+                self.border_subtitle = ""
+                if new_data is not None and day is None:  # Only today is shown on startup
+                    await asyncio.to_thread(save_state, "obsidian", new_data)
+                self.run_worker(self._prefetch_neighbours, group="obsidian_prefetch", exclusive=True)
+        finally:
+            self.refreshing = False
+
+    async def _prefetch_neighbours(self) -> None:
+        """Fetch the days around the one shown, so moving to them is instant."""
+        day = self.current_day()
+        await asyncio.to_thread(self.client.prefetch,
+                                [(day + timedelta(days=offset)).isoformat() for offset in (-1, 1)])
+
+    def current_day(self) -> date:
+        return self.day or date.today()
+
+    def show_day(self, day: date) -> None:
+        """Show the note of another day: at once from the client's memory when
+        it is there, then revalidated in the background like any refresh."""
+        if self.client is None:
+            return
+        self.day = None if day == date.today() else day
+        self.border_title = self.BORDER_TITLE if self.day is None else \
+            f"{self.BORDER_TITLE} - {day.strftime('%a %d/%m/%Y')}"
+        cached = self.client.peek(day.isoformat())
+        if cached is not None:
+            self.update_data(cached)
+        else:
+            self.query_one(DailyStats).update_data({"loading": True})
+            patch_selection_list(self.query_one("#daily_todo_list", SelectionList),
+                                 [("Loading daily todo list...", None, False)])
+            self.documents.pop("daily_todo", None)  # Nothing to toggle until it's fetched
+        self.refresh_data()
+
+    def action_previous_day(self) -> None:
+        self.show_day(self.current_day() - timedelta(days=1))
+
+    def action_next_day(self) -> None:
+        self.show_day(self.current_day() + timedelta(days=1))
 
+    def action_today(self) -> None:
+        self.show_day(date.today())
+
+    def show_stale(self) -> None:
+        """Tell how old the data shown is, while the backend can't be reached."""
+        if self.fetched_at is None:
+            return
+        fetched = datetime.fromtimestamp(self.fetched_at)
+        when = fetched.strftime("%H:%M" if fetched.date() == datetime.now().date() else "%d/%m %H:%M")
+        self.border_subtitle = f"Stale since {when}"
+
+    @timed("update")
     def update_data(self, new_data: dict) -> None:
         """Update the data and refresh the widget's content."""
-        if self.uploading:
-            logger.warning(
-                "Data is currently being uploaded, skipping update.")
+        daily_stats = self.query_one(DailyStats)
+        if "error" in new_data:
+            if self.data is None or "loading" in daily_stats.routine_dict:
+                # Replace the loading placeholder, later errors keep the last data shown
+                self.data = new_data
+                self.documents.pop("daily_todo", None)  # The general list stays usable
+                daily_stats.update_data(self.data)
+                for list_id, text in TODO_LIST_ERRORS.items():
+                    selection_list = self.query_one(f"#{list_id}", SelectionList)
+                    # Only the "Loading..." placeholders, items already shown stay
+                    if selection_list.option_count == 1 and \
+                            selection_list.get_option_at_index(0).value is None:
+                        selection_list.replace_option_prompt_at_index(0, text)
             return
         self.data = new_data
-        if "error" in self.data:
-            return
-        # Update SelectionList
-        daily_todo_list = self.query_one("#daily_todo_list", SelectionList)
-        daily_todo_list.clear_options()
-        for item in todo_list_formatting(self.data["daily_todo"]):
-            daily_todo_list.add_option(item)
+        # Update SelectionLists
+        self.parse_documents()
+        for list_id, key in TODO_LISTS.items():
+            patch_selection_list(self.query_one(f"#{list_id}", SelectionList),
+                                 self.documents[key].options())
         # Update DailyStats
-        daily_stats = self.query_one(DailyStats)
         daily_stats.update_data(self.data["routine"])
 
+    def parse_documents(self) -> None:
+        """Parse the todo lists of the current data, once per payload."""
+        if self.uploads is None:
+            self.documents = {key: TodoDocument(self.data[key]) for key in TODO_LISTS.values()}
+        else:
+            # With the edits not uploaded yet
+            self.documents = {key: self.uploads.rebase(self.todo_target(key), self.data[key])
+                              for key in TODO_LISTS.values()}
+
+    @timed("compose")
     def compose(self) -> ComposeResult:
-        if "error" in self.data:
+        if self.data is None:
+            yield DailyStats(routine_dict={"loading": True}, small_screen=self.small_screen)
+            yield SelectionList[tuple](("Loading daily todo list...", None, False), id="daily_todo_list", compact=True)
+            yield DailyCalendar(data=DEFAULT_CALENDAR, small_screen=self.small_screen)
+            yield SelectionList[tuple](("Loading todo list...", None, False), id="todo_list", compact=True)
+        elif "error" in self.data:
             yield DailyStats(routine_dict={"error": "Error fetching data."}, small_screen=self.small_screen)
-            yield SelectionList[int](("Error fetching daily todo list.", 0, False), id="daily_todo_list", compact=True)
+            yield SelectionList[tuple]((TODO_LIST_ERRORS["daily_todo_list"], None, False), id="daily_todo_list", compact=True)
             yield DailyCalendar(data="Error fetching calendar data.", small_screen=self.small_screen)
-            yield SelectionList[int](("Error fetching todo list.", 0, False), id="todo_list", compact=True)
+            yield SelectionList[tuple]((TODO_LIST_ERRORS["todo_list"], None, False), id="todo_list", compact=True)
         else:
+            self.parse_documents()
             yield DailyStats(routine_dict=self.data["routine"], small_screen=self.small_screen)
-            yield SelectionList[int](*todo_list_formatting(self.data["daily_todo"]), id="daily_todo_list", compact=True)
+            yield SelectionList[tuple](*self.documents["daily_todo"].options(), id="daily_todo_list", compact=True)
             yield DailyCalendar(data=DEFAULT_CALENDAR, small_screen=self.small_screen)
-            yield SelectionList[int](*todo_list_formatting(self.data["todo"]), id="todo_list", compact=True)
-
-    def _get_new_todo_list(self, id: str) -> str:
-        """Get the current todo list from the SelectionList."""
-        self.uploading = True
-        selected_list = self.query_one(id, SelectionList).selected
-        if id == "#daily_todo_list":
-            key = "daily_todo"
-        elif id == "#todo_list":
-            key = "todo"
-        else:
-            key = "todo"  # Default fallback
-        # loop through the todo list text and find the selected item
-        selection_list = todo_list_formatting(self.data[key])
-        new_todo = self.data[key].splitlines()
-        current_index = 0
-        for index, line in enumerate(self.data[key].splitlines()):
-            logger.debug(selection_list[current_index][0])
-            line_matching = selection_list[current_index][0] in line.replace(
-                "[", "").replace("]", "")
-
-            if line.startswith("- ["):
-                if line.startswith("- [ ]"):
-                    if line_matching and current_index in selected_list:
-                        new_todo[index] = new_todo[index].replace(
-                            "- [ ]", "- [x]")
-
-                if line.startswith("- [x]"):
-                    if line_matching and current_index not in selected_list:
-                        new_todo[index] = new_todo[index].replace(
-                            "- [x]", "- [ ]")
-                current_index += 1
-
-        return "\n".join(new_todo)
-
-    @on(SelectionList.SelectedChanged, "#daily_todo_list")
-    def upload_daily_todo_list_change(self) -> None:
-        return  # updating has to be fixed
-        if "error" in self.data:
-            logger.error("No data available to update todo list.")
+            yield SelectionList[tuple](*self.documents["todo"].options(), id="todo_list", compact=True)
+
+    @on(SelectionList.SelectionToggled)
+    def on_todo_toggled(self, event: SelectionList.SelectionToggled) -> None:
+        """Check or uncheck the toggled item in its document, a single line edit."""
+        data_key = TODO_LISTS.get(event.selection_list.id)
+        document = self.documents.get(data_key)
+        key = event.selection.value
+        if document is None or key not in document:
             return
-
-        self.data["daily_todo"] = self._get_new_todo_list("#daily_todo_list")
-        self._get_new_todo_list("#daily_todo_list")
-
-        try:
-            response = requests.post(
-                f"{API_URL}/daily/{datetime.now().strftime('%Y-%m-%d')}/update_todo",
-                headers={"X-API-KEY": API_KEY,
-                         "Content-Type": "application/json"},
-                json={"daily_todo": self.data["daily_todo"]},
-            )
-            response.raise_for_status()
-            logger.debug("Todo list updated successfully.")
-        except requests.RequestException as e:
-            logger.error(f"Failed to update todo list: {e}")
-
-        self.uploading = False
-
-    @on(SelectionList.SelectedChanged, "#todo_list")
-    def upload_todo_list_change(self) -> None:
-        return  # updating has to be fixed
-
-        if "error" in self.data:
-            logger.error("No data available to update todo list.")
-            return
-
-        self.data["todo"] = self._get_new_todo_list("#todo_list")
-
-        try:
-            response = requests.post(
-                f"{API_URL}/to_do_list/update",
-                headers={"X-API-KEY": API_KEY,
-                         "Content-Type": "application/json"},
-                json={"todo": self.data["todo"]},
-            )
-            response.raise_for_status()
-            logger.debug("Todo list updated successfully.")
-        except requests.RequestException as e:
-            logger.error(f"Failed to update todo list: {e}")
-
-        self.uploading = False
-
+        line = document[key].line
+        before = document.lines[line]
+        # The list as the backend has it, unless edits are pending (then ignored)
+        base = document.text()
+        if document.set_done(key, key in event.selection_list.selected):
+            # Shown already, uploaded in the background
+            self.uploads.record(self.todo_target(data_key), base,
+                                LineChange(key, line, before, document.lines[line]))
+
+    def todo_target(self, data_key: str) -> str:
+        """Name of a todo list of the current data for uploads (see ObsidianClient.upload_todo)."""
+        if data_key == "daily_todo":
+            return f"daily_todo:{self.data.get('date') or self.current_day().isoformat()}"
+        return data_key
+
+    @timed("mount")
     def on_mount(self) -> None:
         self.query_one("#daily_todo_list",
                        SelectionList).border_title = "Daily Todo List"
         self.query_one("#todo_list", SelectionList).border_title = "Todo List"
-
-    def watch_time(self, time: datetime) -> None:
-        """Update the widget's content based on the current time."""
-        if time.second % 15 == 0:  # Update every 15 seconds
-            if not self.uploading:
-                logger.debug(f"Updating data at {time}")
-                self.data = self._get_data()
-                self.update_data(self.data)
+        self.refresh_data()
+        if self.subscription is not None:
+            self.subscription.start()
+            self.run_worker(self.uploads.run, group="todo_uploads")
+
+    def on_unmount(self) -> None:
+        if self.subscription is not None:
+            self.subscription.stop()
+
+    @on(NotesChanged)
+    def on_notes_changed(self, event: NotesChanged) -> None:
+        logger.debug("Obsidian notes changed (%s)", event.kind)
+        self.refresh_data()
+
+    def tick(self, time: datetime) -> None:
+        """Poll for new data while the events stream is down."""
+        if self.client is not None and not self.subscription.connected:
+            logger.debug("Updating data at %s", time)
+            self.refresh_data()
@@ -6,20 +6,25 @@ from textual.app import App, ComposeResult, Screen
 from textual.containers import Horizontal, Center, Middle, Vertical
 from textual.widget import Widget
 from textual.color import Gradient
-from textual.widgets import Button, Digits, Footer, Header, ProgressBar, Static, Tooltip
+from textual.widgets import Button, Digits, ProgressBar, Static
 from textual.timer import Timer
-from textual.reactive import reactive
-from datetime import datetime
-from dashboard.logger import logger
-from dashboard.utils import play_sound
-from pathlib import Path
-import threading
+from dashboard.logger import get_logger
+from dashboard.utils import (BREAK_END_SOUND, WORK_END_SOUND, load_state, save_state_later,
+                             sound_player, timed)
+from typing import Callable
+import math
+import time
 from textual import on
 from textual.events import Click
 from textual.message import Message
 
+logger = get_logger(__name__)
+
 WORK_DURATION = 25 * 60
 BREAK_DURATION = 5 * 60
+# Delay (seconds) added to the wake-up at the next displayed second, so the
+# timer never fires just before it
+TICK_SLACK = 0.005
 
 
 def count_to_time(count) -> str:
@@ -44,6 +49,60 @@ def count_to_minimal_time(count) -> str:
     return f"{minutes:02}:{seconds:02}"
 
 
+class PomodoroEngine:
+    """
+    Countdown computed from a monotonic deadline instead of counting timer
+    callbacks, so it stays exact when the event loop is blocked.
+    """
+
+    def __init__(self, duration: int, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.reset(duration)
+
+    def reset(self, duration: int, remaining: float | None = None) -> None:
+        """Stop and rewind to a new countdown of `duration` seconds, or to one
+        already under way with `remaining` seconds left."""
+        self.duration = duration
+        self.deadline = None  # Set while running
+        self._remaining = float(duration if remaining is None else remaining)
+
+    @property
+    def running(self) -> bool:
+        return self.deadline is not None
+
+    def start(self) -> None:
+        """Start or resume the countdown."""
+        if not self.running:
+            self.deadline = self.clock() + self._remaining
+
+    def pause(self) -> None:
+        if self.running:
+            self._remaining = self.remaining()
+            self.deadline = None
+
+    def chain(self, duration: int) -> None:
+        """Start the next countdown from the moment this one ended, not from
+        when the end was noticed, so phases never drift."""
+        end = self.deadline if self.running else self.clock()
+        self.duration = duration
+        self._remaining = float(duration)
+        self.deadline = end + duration
+
+    def remaining(self) -> float:
+        if self.running:
+            return max(0.0, self.deadline - self.clock())
+        return self._remaining
+
+    def remaining_seconds(self) -> int:
+        """Remaining time rounded up, as displayed: 25:00 until a full second elapsed."""
+        return math.ceil(self.remaining())
+
+    def until_next_second(self) -> float:
+        """Seconds until `remaining_seconds` changes."""
+        remaining = self.remaining()
+        return remaining - (math.ceil(remaining) - 1)
+
+
 class TimeDisplay(Digits):
     """A widget to display elapsed time."""
 
@@ -124,7 +183,7 @@ class PomodoroConfigPopup(Screen):
     def apply_config(self) -> None:
         """Apply configuration and close modal screen."""
         logger.debug(
-            f"Apply button pressed in modal screen: work={self.work_duration}s, break={self.break_duration}s")
+            "Apply button pressed in modal screen: work=%ss, break=%ss", self.work_duration, self.break_duration)
 
         # Try both message posting and direct method call for reliability
         try:
@@ -133,7 +192,7 @@ class PomodoroConfigPopup(Screen):
                 self.work_duration, self.break_duration))
             logger.debug("ConfigApplied message posted")
         except Exception as e:
-            logger.error(f"Failed to post message: {e}")
+            logger.error("Failed to post message: %s", e)
 
         # Also try direct method call if parent widget reference exists
         if hasattr(self, 'parent_widget'):
@@ -143,21 +202,10 @@ class PomodoroConfigPopup(Screen):
                 self.parent_widget.break_duration = self.break_duration
 
                 # Always reset the timer state
-                self.parent_widget.started = False
-                self.parent_widget.count = 0
-                self.parent_widget.work_mode = True
-                self.parent_widget.target_count = self.work_duration
-                self.parent_widget.pause = True
-
-                # Stop the timer if it's running
-                if hasattr(self.parent_widget, 'progress_timer'):
-                    self.parent_widget.progress_timer.pause()
-
-                # Reset the display
-                self.parent_widget.reset_display(self.work_duration)
+                self.parent_widget.reset_timer()
                 logger.debug("Direct method call successful")
             except Exception as e:
-                logger.error(f"Failed direct method call: {e}")
+                logger.error("Failed direct method call: %s", e)
 
         # Close the modal screen
         self.app.pop_screen()
@@ -175,14 +223,11 @@ class ConfigApplied(Message):
 class PomodoroWidget(Widget):
     """Pomodoro widget that adapts its display based on screen size."""
 
-    time: reactive[datetime] = reactive(datetime.now)
-
     BORDER_TITLE = "Pomodoro Timer"
 
-    progress_timer: Timer
-    """Timer to simulate progress happening."""
+    progress_timer: Timer | None = None
+    """One-shot timer due when the engine reaches a new second to display."""
 
-    count = 0
     work_mode = True
     started = False
     paused = True
@@ -197,11 +242,13 @@ class PomodoroWidget(Widget):
             self.BORDER_TITLE = "Pomodoro Timer"
         # Ensure proper initial state
         self.started = False
-        self.count = 0
         self.work_mode = True
         self.pause = True
         self.target_count = self.work_duration
+        self.engine = PomodoroEngine(self.work_duration)
+        self.displayed_remaining = None  # Last second rendered
 
+    @timed("compose")
     def compose(self) -> ComposeResult:
         # Only compose the timer mode
         if self.small_screen:
@@ -230,20 +277,27 @@ class PomodoroWidget(Widget):
             self.pause = False
         else:
             logger.debug(
-                "pomodoro clicked and started. pause = "+str(self.pause))
-            self.progress_timer.resume() if self.pause else self.progress_timer.pause()
+                "pomodoro clicked and started. pause = %s", self.pause)
+            if self.pause:
+                self.engine.start()
+                self.schedule_progress()
+            else:
+                self.engine.pause()
+                self.stop_progress()
             self.pause = not self.pause
+            self.update_display(self.engine.remaining_seconds(), self.pause)
+        self.save_state()
 
     def on_mouse_down(self, event: Click) -> None:
         """Handle right click to open configuration popup."""
         logger.debug(
-            f"Mouse down event received: button={event.button}, x={event.x}, y={event.y}")
+            "Mouse down event received: button=%s, x=%s, y=%s", event.button, event.x, event.y)
         if event.button == 3:  # Right click
             logger.debug("Right click detected, opening config popup")
             self.show_config_popup()
         else:
             logger.debug(
-                f"Non-right click detected: button={event.button}, treating as left click")
+                "Non-right click detected: button=%s, treating as left click", event.button)
             # Handle as left click for timer control
             self.on_click()
 
@@ -265,7 +319,7 @@ class PomodoroWidget(Widget):
     def on_config_applied(self, event: ConfigApplied) -> None:
         """Apply new configuration from popup."""
         logger.debug(
-            f"ConfigApplied message received: work={event.work_duration}s, break={event.break_duration}s")
+            "ConfigApplied message received: work=%ss, break=%ss", event.work_duration, event.break_duration)
 
         # Update the durations
         old_work = self.work_duration
@@ -274,60 +328,118 @@ class PomodoroWidget(Widget):
         self.break_duration = event.break_duration
 
         logger.debug(
-            f"Updated durations: work {old_work}s -> {self.work_duration}s, break {old_break}s -> {self.break_duration}s")
+            "Updated durations: work %ss -> %ss, break %ss -> %ss", old_work, self.work_duration, old_break, self.break_duration)
 
         # Always reset the timer state when configuration changes
         logger.debug("Resetting timer state due to configuration change")
+        self.reset_timer()
+        logger.debug("Timer reset to %ss work duration", self.work_duration)
+
+    def reset_timer(self) -> None:
+        """Stop the timer and rewind it to the start of a work session."""
         self.started = False
-        self.count = 0
         self.work_mode = True
         self.target_count = self.work_duration
         self.pause = True
+        self.engine.reset(self.work_duration)
 
         # Stop the timer if it's running
-        if hasattr(self, 'progress_timer'):
-            self.progress_timer.pause()
+        self.stop_progress()
 
         # Reset the display to show the new work duration
         self.reset_display(self.work_duration)
-        logger.debug(f"Timer reset to {self.work_duration}s work duration")
-
+        self.save_state()
+
+    def save_state(self) -> None:
+        """Persist the timer, so a restart resumes it where it was."""
+        save_state_later("pomodoro", {
+            "work_duration": self.work_duration,
+            "break_duration": self.break_duration,
+            "started": self.started,
+            "paused": self.pause,
+            "work_mode": self.work_mode,
+            "remaining": self.engine.remaining(),
+        })
+
+    def restore_state(self) -> None:
+        """Resume the timer saved by a previous run. The time elapsed since
+        counts when it was running; a phase that ended meanwhile is not
+        chained, the timer is rewound instead."""
+        snapshot = load_state("pomodoro")
+        if snapshot is None:
+            self.reset_display(self.work_duration)
+            return
+        state = snapshot.value
+        self.work_duration = state["work_duration"]
+        self.break_duration = state["break_duration"]
+        remaining = state["remaining"]
+        if not state["paused"]:
+            remaining -= snapshot.age
+        if not state["started"] or remaining <= 0:
+            self.reset_timer()
+            return
+        self.started = True
+        self.work_mode = state["work_mode"]
+        self.pause = state["paused"]
+        self.target_count = self.work_duration if self.work_mode else self.break_duration
+        self.engine.reset(self.target_count, remaining)
+        self.reset_display(self.target_count)
+        self.update_display(self.engine.remaining_seconds(), self.pause)
+        if not self.pause:
+            self.engine.start()
+            self.schedule_progress()
+
+    @timed("mount")
     def on_mount(self) -> None:
-        """Set up a timer to simulate progress happening."""
-        self.progress_timer = self.set_interval(
-            1, self.make_progress, pause=True)
+        """Preload the sounds and resume the saved timer."""
+        # Decoded in the background now rather than when a phase ends
+        sound_player.preload(WORK_END_SOUND, BREAK_END_SOUND)
         # Ensure the display is properly initialized
-        self.reset_display(self.work_duration)
-
+        self.restore_state()
+
+    def schedule_progress(self) -> None:
+        """Wake up once, when the displayed second changes: a running timer
+        costs one wake-up per second."""
+        self.stop_progress()
+        if self.engine.running:
+            self.progress_timer = self.set_timer(
+                self.engine.until_next_second() + TICK_SLACK, self.on_progress_timer)
+
+    def stop_progress(self) -> None:
+        if self.progress_timer is not None:
+            self.progress_timer.stop()
+            self.progress_timer = None
+
+    def on_progress_timer(self) -> None:
+        self.progress_timer = None
+        self.make_progress()
+        self.schedule_progress()
+
+    @timed("update")
     def make_progress(self) -> None:
-        """Called automatically to advance the progress bar."""
-        self.count += 1
-
-        if self.count == self.target_count:
-            if not self.small_screen:
-                self.query_one("#timer-progress", ProgressBar).advance(1)
-            self.progress_timer.pause()
-            self.count = 0
-            sound_dir_path = Path(__file__).parent.parent / "assets"
-
-            sound_to_play = str(sound_dir_path/"sonnerie.mp3") if self.work_mode else str(
-                sound_dir_path/"encore_du_travail.mp3")
-
-            def play_notification(): return play_sound(sound_to_play)
-            threading.Thread(target=play_notification,
-                             daemon=True).start()
+        """Called automatically, renders only when the displayed second changes."""
+        remaining_time = self.engine.remaining_seconds()
+        if remaining_time == self.displayed_remaining:
+            return
+
+        if remaining_time == 0:
+            sound_player.play(
+                WORK_END_SOUND if self.work_mode else BREAK_END_SOUND)
             self.work_mode = not self.work_mode
             self.target_count = self.work_duration if self.work_mode else self.break_duration
 
+            self.engine.chain(self.target_count)
             self.reset_display(self.target_count)
-            self.progress_timer.resume()
+            self.save_state()
+            # Catch up if the loop was blocked past the phase change
+            self.make_progress()
 
         else:
-            remaining_time = self.target_count - self.count
             self.update_display(remaining_time, self.pause)
 
     def update_display(self, remaining_time: int, is_paused: bool = False):
         """Update the display based on screen size."""
+        self.displayed_remaining = remaining_time
         if self.small_screen:
             # Minimal display
             mode_text = "WORK" if self.work_mode else "BREAK"
@@ -337,14 +449,16 @@ class PomodoroWidget(Widget):
                            Static).update(f"{mode_text} {time_text} {status}")
         else:
             # Full display
-            self.query_one("#timer-progress", ProgressBar).advance(1)
+            self.query_one("#timer-progress", ProgressBar).update(
+                progress=self.target_count - remaining_time)
             self.query_one("#timer-digits", Digits).update("    " +
                                                            count_to_time(remaining_time))
 
     def reset_display(self, target_time: int):
         """Reset the display for a new timer."""
         logger.debug(
-            f"Resetting display: target_time={target_time}s, work_mode={self.work_mode}, small_screen={self.small_screen}")
+            "Resetting display: target_time=%ss, work_mode=%s, small_screen=%s", target_time, self.work_mode, self.small_screen)
+        self.displayed_remaining = target_time
         if self.small_screen:
             # Minimal display
             mode_text = "WORK" if self.work_mode else "BREAK"
@@ -357,15 +471,17 @@ class PomodoroWidget(Widget):
                            ProgressBar).update(total=target_time, progress=0)
             self.query_one("#timer-digits",
                            Digits).update("    " + count_to_time(target_time))
-        logger.debug(f"Display reset complete: {count_to_time(target_time)}")
+        logger.debug("Display reset complete: %ss", target_time)
 
     def action_start(self, target_time) -> None:
         """Start the progress tracking."""
-        logger.debug(f"Starting timer with target time: {target_time}s")
+        logger.debug("Starting timer with target time: %ss", target_time)
         self.started = True
         self.pause = False
         self.target_count = target_time
-        self.count = 0
+        self.engine.reset(target_time)
+        self.engine.start()
         self.reset_display(target_time)
-        self.progress_timer.resume()
+        self.schedule_progress()
+        self.save_state()
         logger.debug("Timer started successfully")
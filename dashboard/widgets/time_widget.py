@@ -1,18 +1,28 @@
-from itertools import cycle
-from pytz import timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from textual.reactive import reactive
 from datetime import datetime
 from textual.app import ComposeResult
 from textual.widgets import Digits, Label, Static
-from textual.containers import Center
-from datetime import datetime
-from dashboard.logger import logger
+from textual.containers import Center, Vertical
+from textual.events import Click
+from dashboard.logger import get_logger
+from dashboard.utils import SECOND, MINUTE, timed
 from textual.widget import Widget
+import os
+
+logger = get_logger(__name__)
+
+# Zones cycled through on click and listed in world clock mode,
+# overridable with a comma separated DASHBOARD_TIMEZONES
+DEFAULT_TIMEZONES = ("Europe/Paris", "Europe/London")
 
-timezone_cycle = cycle([
-    "Europe/Paris",
-    "Europe/London"
-])
+
+def get_timezones() -> list[str]:
+    """Get the configured timezones, in display order."""
+    zones = os.getenv("DASHBOARD_TIMEZONES")
+    if zones:
+        return [zone.strip() for zone in zones.split(",") if zone.strip()]
+    return list(DEFAULT_TIMEZONES)
 
 
 def title(timezone: str) -> str:
@@ -22,7 +32,7 @@ def title(timezone: str) -> str:
     elif timezone == "Europe/London":
         return "Time in UK 🇬🇧"
     else:
-        return f"Time in {timezone}"
+        return f"Time in {city(timezone)}"
 
 
 def get_flag(timezone: str) -> str:
@@ -35,49 +45,153 @@ def get_flag(timezone: str) -> str:
         return "🌍"
 
 
+def city(timezone: str) -> str:
+    """Get the city part of a timezone name, e.g. "New York" for America/New_York."""
+    return timezone.rsplit("/", 1)[-1].replace("_", " ")
+
+
+class ZoneClock:
+    """The time in one timezone, formatted from a shared epoch.
+    The zone is resolved once, and the date and HH:MM strings are only
+    recomputed when the minute changes: other ticks only add the seconds.
+    UTC offsets only change on minute boundaries, so the cached strings
+    stay valid for the whole minute."""
+
+    def __init__(self, timezone: str):
+        self.timezone = timezone
+        self.zone = ZoneInfo(timezone)
+        self.flag = get_flag(timezone)
+        self.title = title(timezone)
+        self.city = city(timezone)
+        self.epoch_minute = None  # Minute the cached strings are for
+        self.day = None
+        self.hour_minute = ""  # "HH:MM"
+        self.date = ""  # "Saturday, 18 October 2025"
+        self.short_date = ""  # "18/10"
+
+    def update(self, epoch: int) -> None:
+        epoch_minute = epoch // 60
+        if epoch_minute == self.epoch_minute:
+            return
+        self.epoch_minute = epoch_minute
+        local = datetime.fromtimestamp(epoch_minute * 60, self.zone)
+        self.hour_minute = local.strftime("%H:%M")
+        day = local.date()
+        if day != self.day:
+            self.day = day
+            self.date = local.strftime("%A, %d %B %Y")
+            self.short_date = local.strftime("%d/%m")
+
+    def clock(self, epoch: int) -> str:
+        """HH:MM:SS, call update(epoch) first."""
+        return f"{self.hour_minute}:{epoch % 60:02}"
+
+
 class TimeWidget(Widget):
     """A widget to display the current time in a specified timezone.
-    It allows the user to click and change the timezone displayed.
-    The time updates are done reactively in the main app that sets the time."""
+    It allows the user to click and change the timezone displayed, or right
+    click to switch to a world clock listing every configured timezone.
+    The time is set by the screen's tick scheduler, every second, or every
+    minute on small screens where seconds are not displayed."""
 
     time: reactive[datetime] = reactive(datetime.now)
 
-    def __init__(self, timezone: str, small_screen: bool = False):
-        self.timezone = timezone
+    def __init__(self, timezone: str, small_screen: bool = False, world_clock: bool = False):
+        timezones = get_timezones()
+        if timezone not in timezones:
+            timezones.insert(0, timezone)
+        self.clocks = []
+        for zone in timezones:
+            try:
+                self.clocks.append(ZoneClock(zone))
+            except (ZoneInfoNotFoundError, ValueError) as e:
+                logger.warning("Skipping unknown timezone %r: %s", zone, e)
+        if not self.clocks:
+            self.clocks.append(ZoneClock("UTC"))
+        names = [clock.timezone for clock in self.clocks]
+        self.index = names.index(timezone) if timezone in names else 0
+        self.world_clock = world_clock
         self.small_screen = small_screen
-        if not small_screen:
-            self.BORDER_TITLE = title(self.timezone)
+        self.TICK_EVERY = MINUTE if small_screen else SECOND
+        self.shown = {}  # Text last rendered in each part, by id
+        self.parts = {}  # Widgets of each part, by id
         super().__init__()
 
-    def on_click(self) -> None:
-        """Handle click events to change the timezone."""
-        logger.debug(
-            f"Clicked on TimeWidget, changing timezone from {self.timezone}")
-        self.timezone = next(timezone_cycle)
-        if not self.small_screen:
-            self.border_title = title(self.timezone)
+    @property
+    def timezone(self) -> str:
+        return self.clocks[self.index].timezone
+
+    def on_click(self, event: Click) -> None:
+        """Handle click events to change the timezone, or right click to
+        toggle the world clock."""
+        if event.button == 3:
+            self.world_clock = not self.world_clock
+            logger.debug("Clicked on TimeWidget, world clock=%s", self.world_clock)
+            self.query_one("#single-clock").display = not self.world_clock
+            self.query_one("#world-clock").display = self.world_clock
+        else:
+            logger.debug(
+                "Clicked on TimeWidget, changing timezone from %s", self.timezone)
+            self.index = (self.index + 1) % len(self.clocks)
+        self.update_title()
         self.watch_time(self.time)
 
+    def update_title(self) -> None:
+        if not self.small_screen:
+            self.border_title = "World Clock 🌍" if self.world_clock else self.clocks[self.index].title
+
+    def tick(self, time: datetime) -> None:
+        self.time = time
+
+    @timed("compose")
     def compose(self) -> ComposeResult:
         if self.small_screen:
             # Minimal format for small screens
-            yield Static("Loading...", classes="center")
+            yield Static("Loading...", classes="center", id="single-clock")
         else:
             # Regular format
-            with Center():
-                yield Label("Date", classes="center")
-                yield Digits("test", classes="center")
+            with Center(id="single-clock"):
+                yield Label("Date", classes="center", id="date")
+                yield Digits("test", classes="center", id="digits")
+        with Vertical(id="world-clock"):
+            for index in range(len(self.clocks)):
+                yield Static("", classes="world-clock-row", id=f"clock-{index}")
+
+    @timed("mount")
+    def on_mount(self) -> None:
+        self.query_one("#single-clock").display = not self.world_clock
+        self.query_one("#world-clock").display = self.world_clock
+        self.update_title()
 
+    def show(self, part: str, text: str) -> None:
+        """Update a part of the widget, only if its text changed."""
+        if self.shown.get(part) != text:
+            self.shown[part] = text
+            if part not in self.parts:
+                self.parts[part] = self.query_one(f"#{part}")
+            self.parts[part].update(text)
+
+    @timed("update")
     def watch_time(self, time: datetime) -> None:
-        localized_time = time.astimezone(timezone(self.timezone))
+        epoch = int(time.timestamp())
+
+        if self.world_clock:
+            for index, clock in enumerate(self.clocks):
+                clock.update(epoch)
+                if self.small_screen:
+                    text = f"{clock.flag} {clock.city} {clock.hour_minute}"
+                else:
+                    text = f"{clock.flag} {clock.city:<14} {clock.clock(epoch)}  {clock.short_date}"
+                self.show(f"clock-{index}", text)
+            return
 
+        clock = self.clocks[self.index]
+        clock.update(epoch)
         if self.small_screen:
             # Minimal format: "HH:MM DD/MM" with flag
-            flag = get_flag(self.timezone)
-            minimal_time = localized_time.strftime("%H:%M %d/%m")
-            self.query_one(Static).update(f"{flag} {minimal_time}")
+            self.show(
+                "single-clock", f"{clock.flag} {clock.hour_minute} {clock.short_date}")
         else:
             # Regular format
-            self.query_one(Digits).update(localized_time.strftime("%H:%M:%S"))
-            self.query_one(Label).update(
-                localized_time.strftime("%A, %d %B %Y"))
+            self.show("digits", clock.clock(epoch))
+            self.show("date", clock.date)
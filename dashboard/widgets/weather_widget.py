@@ -1,63 +1,111 @@
 import datetime
-from dashboard.logger import logger
+from dashboard.logger import get_logger
 from textual.widget import Widget
-from textual.widgets import Label, Log, Static, Markdown, TextArea
+from textual.widgets import Static
 from textual.app import ComposeResult
 from datetime import datetime
-from textual.reactive import reactive
 from itertools import cycle
-import requests
 from textual.events import MouseEvent
 import json
-from rich.text import Text
-from dashboard.utils import get_city, get_weather, get_minimal_weather
+from dashboard.utils import (get_city_async, get_weather_async, get_minimal_weather_async,
+                             peek_city, peek_weather, peek_minimal_weather, ansi_text,
+                             payload_hash, HOUR, timed)
+
+logger = get_logger(__name__)
 
 
 class WeatherWidget(Widget):
     """A widget to display the current weather"""
-    time: reactive[datetime] = reactive(datetime.now)
+    TICK_EVERY = HOUR
 
     def __init__(self, small_screen: bool = False):
-        self.city = get_city()
+        # The last known city is rendered once mounted, then checked by the
+        # first weather fetch, off the event loop
+        self.city = None
+        self.city_checked = False
+        self.shown_hash = None  # Hash of the payload displayed
         self.small_screen = small_screen
         if not small_screen:
-            self.BORDER_TITLE = f"Weather in {self.city}"
+            self.BORDER_TITLE = "Weather"
 
         super().__init__()
 
     def update_weather(self) -> None:
-        """Update the weather information displayed in the widget."""
+        """Update the weather information displayed in the widget.
+        The fetch runs in a worker so a slow wttr.in never blocks the UI."""
+        self.run_worker(self._fetch_weather,
+                        group="weather", exclusive=True)
+
+    def set_city(self, city: str) -> None:
+        self.city = city
+        if not self.small_screen:
+            self.border_title = f"Weather in {city}"
+
+    def show_cached(self):
+        """Render the cached weather of the current city, even stale, and return its entry."""
         if self.small_screen:
             # Use minimal weather data for small screens
-            weather_info = get_minimal_weather(self.city)
-            if weather_info:
-                # Ensure no trailing whitespace in the display
-                clean_weather_info = weather_info.strip()
-                self.query_one(Static).update(
-                    Text.from_ansi(clean_weather_info))
-            else:
-                self.query_one(Static).update("Weather data unavailable")
+            cached = peek_minimal_weather(self.city)
         else:
             # Use full weather data for regular screens
-            weather_info = get_weather(self.city)
-            if weather_info:
-                # Ensure no trailing whitespace in the display
-                clean_weather_info = weather_info.strip()
-                self.query_one(Static).update(
-                    Text.from_ansi(clean_weather_info))
-            else:
-                self.query_one(Static).update("Weather data unavailable")
+            cached = peek_weather(self.city)
+        if cached is not None:
+            self.show_weather(cached.value)
+        return cached
 
+    def show_last_known(self) -> None:
+        """Render the last known city and weather, before any request is made."""
+        city = peek_city()
+        if city is not None:
+            self.set_city(city)
+            self.show_cached()
+
+    async def _fetch_weather(self) -> None:
+        # The city rendered at startup may be stale, check it once
+        if not self.city_checked:
+            city = await get_city_async()
+            self.city_checked = True
+            if city != self.city:
+                self.set_city(city)
+        # Render cached data instantly, even stale, and only hit wttr.in
+        # when it is missing or expired
+        cached = self.show_cached()
+        if cached is not None and cached.is_fresh:
+            return
+        if self.small_screen:
+            weather_info = await get_minimal_weather_async(self.city)
+        else:
+            weather_info = await get_weather_async(self.city)
+        self.show_weather(weather_info)
+
+    @timed("update")
+    def show_weather(self, weather_info: str | None) -> None:
+        """Display a wttr.in payload; the same payload as shown is not even parsed."""
+        # Ensure no trailing whitespace in the display
+        clean_weather_info = weather_info.strip() if weather_info else ""
+        digest = payload_hash(clean_weather_info)
+        if digest == self.shown_hash:
+            return
+        self.shown_hash = digest
+        if clean_weather_info:
+            self.query_one(Static).update(ansi_text(clean_weather_info, digest))
+        else:
+            self.query_one(Static).update("Weather data unavailable")
+
+    @timed("compose")
     def compose(self) -> ComposeResult:
 
         yield Static("Loading weather info", classes="center")
 
+    @timed("mount")
     def on_mount(self) -> None:
+        self.show_last_known()
         self.update_weather()
 
-    def watch_time(self, time: datetime) -> None:
-        # update only once an hour
-        if time.minute == 0 and time.second == 0:
-            logger.debug(
-                f"Updating weather at {time}")
-            self.update_weather()
+    def on_unmount(self) -> None:
+        self.workers.cancel_group(self, "weather")
+
+    def tick(self, time: datetime) -> None:
+        logger.debug(
+            "Updating weather at %s", time)
+        self.update_weather()